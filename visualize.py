@@ -1,21 +1,470 @@
+import argparse
 import json
+import re
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from matplotlib.widgets import Button, Slider
 import numpy as np
 import sys
 import os
+import time
+from functools import lru_cache
+from itertools import chain
+import textwrap
 from matplotlib.patches import Rectangle, Circle, FancyArrowPatch, FancyBboxPatch
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+from matplotlib.colors import to_rgba
 from matplotlib.gridspec import GridSpec
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+from matplotlib.axis import Axis
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+from matplotlib.animation import FFMpegWriter, PillowWriter
+from matplotlib.backend_bases import key_press_handler
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional - without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path):
+    """Parse a JSON file, with orjson when available (its errors subclass JSONDecodeError)"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@njit(cache=True)
+def _tree_positions(values):
+    """Rebuild the BST from pre-order values -> (parent, depth) per index.
+    parent is -1 for the root and -2 for values that don't fit the tree."""
+    n = values.shape[0]
+    parent = np.full(n, -2, np.int64)
+    depth = np.zeros(n, np.int64)
+
+    # Pending child slots (parent, lower, upper) in pre-order visiting order
+    slot_parent = np.empty(n + 1, np.int64)
+    slot_lower = np.empty(n + 1, np.float64)
+    slot_upper = np.empty(n + 1, np.float64)
+    slot_parent[0], slot_lower[0], slot_upper[0] = -1, -np.inf, np.inf
+    top = 1
+
+    index = 0
+    while index < n and top > 0:
+        top -= 1
+        p, lower, upper = slot_parent[top], slot_lower[top], slot_upper[top]
+        value = values[index]
+        if value <= lower or value >= upper:
+            continue
+
+        parent[index] = p
+        depth[index] = depth[p] + 1 if p >= 0 else 0
+
+        # Right slot goes on the stack first so the left subtree is filled first
+        slot_parent[top], slot_lower[top], slot_upper[top] = index, value, upper
+        slot_parent[top + 1], slot_lower[top + 1], slot_upper[top + 1] = index, lower, value
+        top += 2
+        index += 1
+
+    return parent, depth
+
+
+def _bar_heights(values, offsets):
+    """Sorting bar heights for every step at once: 0.5 + 5 * value normalized
+    to its own step's min/max (a flat step of equal values uses range 1)."""
+    lengths = np.diff(offsets)
+    starts = offsets[:-1][lengths > 0]
+    lo = np.zeros(len(lengths))
+    hi = np.zeros(len(lengths))
+    if len(starts):
+        lo[lengths > 0] = np.minimum.reduceat(values, starts)
+        hi[lengths > 0] = np.maximum.reduceat(values, starts)
+    value_range = np.where(hi != lo, hi - lo, 1.0)
+    return 0.5 + (values - np.repeat(lo, lengths)) / np.repeat(value_range, lengths) * 5.0
+
+
+@njit(cache=True)
+def _bar_style(highlights, n_colors):
+    """Palette index and outline index (1 = highlighted) per bar; unknown
+    highlight codes use palette entry 0."""
+    n = highlights.shape[0]
+    colors = np.zeros(n, np.intp)
+    outlines = np.zeros(n, np.intp)
+    for i in range(n):
+        h = highlights[i]
+        if 0 <= h < n_colors:
+            colors[i] = h
+        if h != 0:
+            outlines[i] = 1
+    return colors, outlines
+
+
+# Open '->' head as a scatter marker, in units of 25 pt: FancyArrowPatch's head at
+# mutation_scale 25 (10 x 5 pt), tip pulled back by its 2 pt shrink plus half the stroke
+_ARROW_HEAD = MarkerStyle(Path([(-0.64, 0.24), (-0.24, 0.0), (-0.64, -0.24)]))
+_ARROW_HEAD_SIZE = (25 * 0.64 / 0.5) ** 2
+
+
+# Action keywords the renderers and statistics care about, as bit flags
+ACTION_PIVOT = 1
+ACTION_DIVIDE = 2
+ACTION_MERGED = 4
+ACTION_COMPARE = 8
+ACTION_SWAP = 16
+ACTION_INSERT = 32
+ACTION_DELETE = 64
+ACTION_INORDER = 128
+ACTION_SEARCH = 256
+
+_ACTION_KEYWORDS = (
+    ('PIVOT', ACTION_PIVOT), ('DIVIDE', ACTION_DIVIDE), ('COMPARE', ACTION_COMPARE),
+    ('SWAP', ACTION_SWAP), ('INSERT', ACTION_INSERT), ('DELETE', ACTION_DELETE),
+    ('INORDER', ACTION_INORDER), ('SEARCH', ACTION_SEARCH),
+)
+
+
+def _classify_action(action):
+    """Fold a C action name into ACTION_* flags"""
+    kind = 0
+    for keyword, flag in _ACTION_KEYWORDS:
+        if keyword in action:
+            kind |= flag
+    if 'MERGE' in action and 'COMPLETE' in action:
+        kind |= ACTION_MERGED
+    return kind
+
+
+def _ragged(rows, dtype):
+    """Pack variable-length rows into (flat, offsets); row i is flat[offsets[i]:offsets[i+1]]"""
+    offsets = np.zeros(len(rows) + 1, np.intp)
+    np.cumsum(np.fromiter(map(len, rows), np.intp, len(rows)), out=offsets[1:])
+    flat = np.fromiter(chain.from_iterable(rows), dtype, offsets[-1])
+    return flat, offsets
+
+
+def _flatten_alpha(color, alpha, background):
+    """Opaque RGB that looks like color drawn at alpha over a plain background"""
+    fg = np.array(to_rgba(color)[:3])
+    bg = np.array(to_rgba(background)[:3])
+    return tuple(bg + (fg - bg) * alpha)
+
+
+# Learning-panel text for C's exact action names
+_EXPLANATIONS = {
+    'BUBBLE_COMPARE': 'Comparing adjacent elements in Bubble Sort.',
+    'BUBBLE_SWAP': 'Swapping adjacent elements because they are in wrong order.',
+    'BUBBLE_COMPLETE': 'Bubble Sort completed! Array is now sorted.',
+    
+    'SELECTION_START': 'Starting new pass of Selection Sort.',
+    'SELECTION_COMPARE': 'Comparing to find minimum element in unsorted portion.',
+    'SELECTION_SWAP': 'Swapping minimum element with current position.',
+    'SELECTION_COMPLETE': 'Selection Sort completed! Array is now sorted.',
+    
+    'INSERTION_START': 'Taking element to insert in correct position.',
+    'INSERTION_SHIFT': 'Shifting elements right to make space.',
+    'INSERTION_PLACE': 'Element placed in its correct sorted position.',
+    'INSERTION_COMPLETE': 'Insertion Sort completed! Array is now sorted.',
+    
+    'QUICK_START': 'Starting Quick Sort - divide and conquer algorithm.',
+    'QUICK_SUBARRAY': 'Processing a subarray - will partition around pivot.',
+    'QUICK_PIVOT_SELECT': 'Selected rightmost element as pivot.',
+    'QUICK_COMPARE': 'Comparing element with pivot for partitioning.',
+    'QUICK_SWAP': 'Swapping elements during partitioning.',
+    'QUICK_PIVOT_PLACE': 'Placing pivot in its final sorted position.',
+    'QUICK_PIVOT_FINAL': 'Pivot is now in correct position, dividing array.',
+    'QUICK_RECURSIVE': 'Recursively sorting left and right subarrays.',
+    'QUICK_COMPLETE': 'Quick Sort completed! Array is now sorted.',
+    
+    'MERGE_START': 'Starting Merge Sort - divide and conquer algorithm.',
+    'MERGE_DIVIDE': 'Dividing array into smaller subarrays.',
+    'MERGE_READY': 'Both halves sorted, ready to merge them.',
+    'MERGE_COMPARE': 'Comparing elements from both sorted subarrays.',
+    'MERGE_TAKE': 'Taking smaller element and placing in merged array.',
+    'MERGE_COPY': 'Copying remaining elements from subarray.',
+    'MERGE_COMPLETE_SUB': 'Subarray successfully merged and sorted.',
+    'MERGE_COMPLETE': 'Merge Sort completed! Array is now sorted.',
+    
+    'LINEAR_SEARCH': 'Checking each element sequentially from left to right.',
+    'LINEAR_SEARCH_FOUND': 'Target element found!',
+    'LINEAR_SEARCH_NOT_FOUND': 'Target not in array after checking all elements.',
+    
+    'BINARY_SEARCH': 'Checking middle element (array must be sorted).',
+    'BINARY_SEARCH_FOUND': 'Target found using binary search!',
+    'BINARY_SEARCH_NOT_FOUND': 'Target not found - search space exhausted.',
+    
+    'PUSH': 'Adding element to top of stack (LIFO).',
+    'POP_BEFORE': 'About to remove element from top of stack.',
+    'POP_AFTER': 'Element removed from stack top.',
+    
+    'ENQUEUE': 'Adding element to rear of queue (FIFO).',
+    'DEQUEUE_BEFORE': 'About to remove element from front of queue.',
+    'DEQUEUE_AFTER': 'Element removed from queue front.',
+    
+    'INSERT_BEGINNING': 'Inserted new node at the beginning of linked list.',
+    'INSERT_END': 'Inserted new node at the end of linked list.',
+    'INSERT_SEQUENTIAL': 'Adding element sequentially to linked list.',
+    'SEARCH_LIST': 'Traversing linked list to find target element.',
+    'SEARCH_LIST_FOUND': 'Target element found in linked list!',
+    'SEARCH_LIST_NOT_FOUND': 'Target not found after traversing entire list.',
+    
+    'INSERT_BST_ROOT': 'Creating root node for Binary Search Tree.',
+    'INSERT_BST_COMPARE_LEFT': 'Value is smaller - moving to left subtree.',
+    'INSERT_BST_COMPARE_RIGHT': 'Value is larger - moving to right subtree.',
+    'INSERT_BST_DUPLICATE': 'Duplicate value - BST does not allow duplicates.',
+    'INSERT_BST_COMPLETE': 'Node inserted while maintaining BST property.',
+    
+    'DELETE_BST_EMPTY': 'Cannot delete from empty BST.',
+    'DELETE_BST_SEARCH': 'Searching for node to delete in BST.',
+    'DELETE_BST_FOUND': 'Node found - proceeding with deletion.',
+    'DELETE_BST_COMPLETE': 'Node deleted and BST structure maintained.',
+    
+    'INORDER_TRAVERSAL': 'Visiting BST nodes in sorted order (left-root-right).'
+}
+_DEFAULT_EXPLANATION = 'Processing data structure operation step by step.'
+
+# Wrap once here instead of Text(wrap=True) re-flowing on every draw; the
+# full-width learning panel fits about this many characters per line
+_EXPLANATION_WIDTH = 100
+_EXPLANATIONS = {k: textwrap.fill(v, _EXPLANATION_WIDTH) for k, v in _EXPLANATIONS.items()}
+
+# Pseudocode keyed by the algorithm prefix of the action name
+_PSEUDOCODE = {
+    'BUBBLE': '''// Bubble Sort
+for (i = 0; i < n-1; i++)
+  for (j = 0; j < n-i-1; j++)
+    if (arr[j] > arr[j+1])
+      swap(&arr[j], &arr[j+1])''',
+      
+    'SELECTION': '''// Selection Sort
+for (i = 0; i < n-1; i++)
+  min_idx = i
+  for (j = i+1; j < n; j++)
+    if (arr[j] < arr[min_idx])
+      min_idx = j
+  swap(&arr[i], &arr[min_idx])''',
+  
+    'INSERTION': '''// Insertion Sort
+for (i = 1; i < n; i++)
+  key = arr[i]
+  j = i - 1
+  while (j >= 0 && arr[j] > key)
+    arr[j+1] = arr[j]
+    j--
+  arr[j+1] = key''',
+  
+    'QUICK': '''// Quick Sort
+quickSort(arr, low, high):
+  if (low < high)
+    pi = partition(arr, low, high)
+    quickSort(arr, low, pi-1)
+    quickSort(arr, pi+1, high)
+    
+partition: pivot = arr[high]
+  i = low - 1
+  for j = low to high-1
+    if arr[j] < pivot
+      swap(arr[++i], arr[j])
+  swap(arr[i+1], arr[high])''',
+  
+    'MERGE': '''// Merge Sort
+mergeSort(arr, left, right):
+  if (left < right)
+    mid = (left + right) / 2
+    mergeSort(arr, left, mid)
+    mergeSort(arr, mid+1, right)
+    merge(arr, left, mid, right)
+    
+merge: combines two sorted halves
+  into single sorted array''',
+  
+    'LINEAR': '''// Linear Search
+for (i = 0; i < n; i++)
+  if (arr[i] == target)
+    return i  // found
+return -1  // not found''',
+  
+    'BINARY': '''// Binary Search (sorted array)
+left = 0, right = n-1
+while (left <= right)
+  mid = left + (right-left)/2
+  if (arr[mid] == target)
+    return mid
+  else if (arr[mid] < target)
+    left = mid + 1
+  else
+    right = mid - 1''',
+  
+    'PUSH': '''// Stack Push
+push(stack, element):
+  if (!isFull())
+    stack.arr[++stack.top] = element''',
+  
+    'POP': '''// Stack Pop
+pop(stack):
+  if (!isEmpty())
+    return stack.arr[stack.top--]''',
+  
+    'ENQUEUE': '''// Queue Enqueue
+enqueue(queue, element):
+  if (!isFull())
+    if (front == -1) front = 0
+    queue.arr[++rear] = element''',
+  
+    'DEQUEUE': '''// Queue Dequeue
+dequeue(queue):
+  if (!isEmpty())
+    element = queue.arr[front++]
+    if (front > rear)
+      front = rear = -1
+    return element''',
+  
+    'INSERT': '''// Linked List Insert
+newNode = createNode(data)
+if (head == NULL)
+  head = newNode
+else
+  temp = head
+  while (temp->next != NULL)
+    temp = temp->next
+  temp->next = newNode''',
+  
+    'SEARCH': '''// Search in List/Tree
+current = head/root
+while (current != NULL)
+  if (current->data == target)
+    return current
+  current = current->next/left/right''',
+  
+    'BST': '''// Binary Search Tree
+insert(root, data):
+  if (root == NULL)
+    return createNode(data)
+  if (data < root->data)
+    root->left = insert(root->left, data)
+  else if (data > root->data)
+    root->right = insert(root->right, data)
+  return root  // no duplicates
+
+delete(root, data):
+  if (root == NULL) return root
+  if (data < root->data)
+    root->left = delete(root->left, data)
+  else if (data > root->data)
+    root->right = delete(root->right, data)
+  else
+    // Node with one or no child
+    if (root->left == NULL)
+      return root->right
+    else if (root->right == NULL)
+      return root->left
+    // Node with two children
+    temp = findMin(root->right)
+    root->data = temp->data
+    root->right = delete(root->right, temp->data)
+  return root'''
+}
+_DEFAULT_PSEUDOCODE = '// Processing data structure\nprocess(structure);'
+
+
+# Every explanation key in one pattern, longest alternatives first
+_EXPLANATION_KEY = re.compile('|'.join(map(re.escape, sorted(_EXPLANATIONS, key=len, reverse=True))))
+
+
+@lru_cache(maxsize=128)
+def _lookup_explanation(action):
+    """Exact name, then longest '_' prefix (QUICK_SWAP_BEFORE -> QUICK_SWAP)"""
+    if not action:
+        return _DEFAULT_EXPLANATION
+    if action in _EXPLANATIONS:
+        return _EXPLANATIONS[action]
+    head = action
+    while '_' in head:
+        head = head.rsplit('_', 1)[0]
+        if head in _EXPLANATIONS:
+            return _EXPLANATIONS[head]
+    # Names the C side doesn't emit: fall back to an embedded key, longest first
+    match = _EXPLANATION_KEY.search(action)
+    if match:
+        return _EXPLANATIONS[match.group()]
+    return _DEFAULT_EXPLANATION
+
+
+@lru_cache(maxsize=128)
+def _lookup_pseudocode(action):
+    """First '_' token that names an algorithm (BUBBLE_SWAP -> BUBBLE, DELETE_BST_FOUND -> BST)"""
+    if not action:
+        return _DEFAULT_PSEUDOCODE
+    for token in action.split('_'):
+        if token in _PSEUDOCODE:
+            return _PSEUDOCODE[token]
+    return _DEFAULT_PSEUDOCODE
+
 
 class AlgorithmVisualizer:
-    def __init__(self):
+    # Past this many nodes per-node text is unreadable anyway - show a count instead
+    MAX_LABELED_NODES = 40
+    
+    # Key -> handler name, see on_key
+    KEYS = {' ': 'toggle_play', 'r': 'reset_animation', 'left': 'step_back',
+            'right': 'step_forward', 'l': 'toggle_learning_mode'}
+    
+    def __init__(self, export_path=None):
         self.steps = []
+        self._action_kind = np.zeros(0, dtype=np.uint16)
+        # Running (comparisons, swaps, inserts) totals up to and including each step
+        self._op_counts = np.zeros((0, 3), dtype=np.int64)
+        # Per-step data/highlighted as flat numpy buffers, see _step_arrays;
+        # highlights are C ints, values stay float for the bar-height math
+        self._values, self._value_offsets = _ragged([], np.float64)
+        self._highlights, self._highlight_offsets = _ragged([], np.int32)
+        # (palette index, outline index) of every highlight, laid out like _highlights
+        self._highlight_styles = np.zeros((2, 0), dtype=np.intp)
+        # Normalized sorting-bar height of every value, laid out like _values
+        self._bar_heights = np.zeros(0)
+        # C's fixed pointers[10] per step, -1 = unused
+        self._pointers = np.full((0, 10), -1, dtype=np.int32)
         self.current_step = 0
         self.is_playing = False
         self.speed = 1.5
         self.config = {}
         self.learning_mode = False
+        # During playback the stats/learning/code panels refresh only every
+        # disp_skip steps (or when the action changes); bars update every tick
+        self.disp_skip = 5
+        # Playback advances this many steps per tick so very long traces still
+        # finish in bounded time; Back/Next always move by one step
+        self.render_budget = 2000
+        self._stride = 1
+        self._slow_panels_step = -1
+        # Set while a timer tick is rendering, so a backlogged tick is dropped
+        self._rendering = False
+        # What the learning/code panels currently show (skip re-layout on repeats)
+        self._last_learn_action = None
+        self._last_code = None
+        # Blitting: static background grabbed on every full draw, None forces a full draw
+        self._bg = None
+        self._panel_artists = []
+        self._panel_groups = {}
+        # Per-axes blitting: axes whose artists changed since the last blit, and the
+        # pixel area each axes' animated artists covered when last painted
+        self._dirty_axes = set()
+        self._regions = {}
+        # Layout key of the persistent artists currently in ax_main (None = rebuild)
+        self._main_view = None
+        # Batch export renders every frame through savefig - no blitting, no timers
+        self.export_path = export_path
         
         self.colors = {
             'bg': '#0F172A', 'panel_bg': '#1E293B', 'dark_bg': '#0A0E1A',
@@ -29,23 +478,69 @@ class AlgorithmVisualizer:
             'highlight_4': '#9F7AEA',  # Purple - merged/completed
         }
         
+        # Parse the hex palette once so patches receive RGBA floats every frame
+        self._rgba = {k: to_rgba(v) for k, v in self.colors.items()}
+        # (5, 4) RGBA table indexed by the C highlight value: 0=default, 1-4=highlight_1..4
+        self._highlight_rgba = np.array([self._rgba[k] for k in (
+            'accent', 'highlight_1', 'highlight_2', 'highlight_3', 'highlight_4')])
+        # Sorting bar outlines, indexed by "is highlighted"
+        self._bar_edge_rgba = np.array([to_rgba('#4A5568'), to_rgba('#FFFFFF')])
+        self._bar_edge_widths = np.array([1.5, 3.0])
+        # Linked-list / BST node and stack / queue box outlines, same indexing
+        self._list_edge_rgba = np.array([to_rgba('#667EEA'), to_rgba('#FFFFFF')])
+        self._tree_edge_rgba = np.array([to_rgba('#9F7AEA'), to_rgba('#FFFFFF')])
+        self._node_edge_widths = np.array([2.0, 4.0])
+        
         self.load_data()
+        self._active_vis = self.pick_visualizer()
         self.setup_figure()
         
+        if self.export_path:
+            self.export_animation(self.export_path)
+            return
+        
         self.is_playing = True
-        self.ani = animation.FuncAnimation(
-            self.fig, self.animate, interval=int(1000/self.speed), 
-            repeat=True, blit=False, cache_frame_data=False
-        )
+        # Plain canvas timer as the frame clock - each tick blits, never a full redraw
+        self.timer = self.fig.canvas.new_timer(interval=int(1000/self.speed))
+        self.timer.add_callback(self.animate)
+        # Playback time starts once the window is up, not while it is being created
+        self._first_draw_cid = self.fig.canvas.mpl_connect('draw_event', self._start_playback)
+        # One-shot timer that applies slider changes once dragging pauses
+        self._speed_timer = self.fig.canvas.new_timer(interval=100)
+        self._speed_timer.single_shot = True
+        self._speed_timer.add_callback(self.apply_speed)
         plt.show()
     
     def load_data(self):
         try:
-            with open('algorithm_steps.json', 'r') as f:
-                data = json.load(f)
-                self.steps = data['steps']
-            with open('algorithm_config.json', 'r') as f:
-                self.config = json.load(f)
+            self.steps = _read_json('algorithm_steps.json')['steps']
+            # Interned action names hash/compare by identity in the lookup caches;
+            # the few complexity strings repeat on every step, so share one copy each
+            for s in self.steps:
+                action = s.get('action')
+                # null / non-string actions still need a string for the lookups to scan
+                s['action'] = sys.intern(action if isinstance(action, str) else str(action or ''))
+                complexity = s.get('complexity', 'N/A')
+                # null or non-string complexities are shown as they are
+                s['complexity'] = sys.intern(complexity) if isinstance(complexity, str) else complexity
+            self._action_kind = np.array([_classify_action(s.get('action', '')) for s in self.steps],
+                                         dtype=np.uint16)
+            flags = np.array([ACTION_COMPARE, ACTION_SWAP, ACTION_INSERT], dtype=np.uint16)
+            self._op_counts = np.cumsum((self._action_kind[:, None] & flags) != 0, axis=0)
+            self._values, self._value_offsets = _ragged(
+                [s['data'] for s in self.steps], np.float64)
+            # Highlights and pointers live only in the packed arrays, not in the step dicts
+            self._highlights, self._highlight_offsets = _ragged(
+                [s.pop('highlighted') if 'highlighted' in s else [0] * len(s['data'])
+                 for s in self.steps], np.int32)
+            self._highlight_styles = np.stack(_bar_style(self._highlights, len(self._highlight_rgba)))
+            self._bar_heights = _bar_heights(self._values, self._value_offsets)
+            self._stride = max(1, len(self.steps) // self.render_budget)
+            self._pointers = np.full((len(self.steps), 10), -1, dtype=np.int32)
+            for i, s in enumerate(self.steps):
+                p = s.pop('pointers', [])[:10]
+                self._pointers[i, :len(p)] = p
+            self.config = _read_json('algorithm_config.json')
             print(f"✅ Loaded {len(self.steps)} steps")
             print(f"📊 Structure: {self.config.get('structure_type', 'unknown')}")
             print(f"⚙️  Operation: {self.config.get('operation', 'unknown')}")
@@ -74,18 +569,46 @@ class AlgorithmVisualizer:
         
         self.ax_progress = self.fig.add_subplot(gs[4:6, 8:12])
         self.ax_progress.set_facecolor(self.colors['panel_bg'])
+        self.ax_progress.set_xlim(0, 1)
+        self.ax_progress.set_ylim(-0.5, 0.5)
+        
+        # Side panels keep a fixed frame - style it once instead of after every clear()
+        for ax in (self.ax_info, self.ax_stats, self.ax_progress):
+            ax.set_xticks([])
+            ax.set_yticks([])
+            for spine in ax.spines.values():
+                spine.set_edgecolor('#4A5568')
+                spine.set_linewidth(1)
         
         self.ax_learn = self.fig.add_subplot(gs[7:9, 0:12])
         self.ax_learn.set_facecolor(self.colors['bg'])
+        self.ax_learn.set_xticks([])
+        self.ax_learn.set_yticks([])
+        for spine in self.ax_learn.spines.values():
+            spine.set_edgecolor('#4299E1')
+            spine.set_linewidth(2)
         
         self.ax_code = self.fig.add_subplot(gs[9:11, 0:8])
         self.ax_code.set_facecolor(self.colors['dark_bg'])
+        self.ax_code.set_xticks([])
+        self.ax_code.set_yticks([])
+        for spine in self.ax_code.spines.values():
+            spine.set_edgecolor('#2D3748')
+            spine.set_linewidth(1)
         
         self.ax_controls = self.fig.add_subplot(gs[11, :])
         self.ax_controls.set_facecolor(self.colors['bg'])
         self.ax_controls.axis('off')
         
         self.setup_ui()
+        self.setup_panels()
+        # Cairo and other non-Agg canvases can't save/restore regions - draw everything normally there
+        self._can_blit = self.fig.canvas.supports_blit
+        if not self._can_blit:
+            print("⚠️  This backend can't blit, falling back to full redraws")
+            for artist in self._panel_artists:
+                artist.set_animated(False)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
         self.update_visualization()
     
     def setup_ui(self):
@@ -116,63 +639,278 @@ class AlgorithmVisualizer:
         self.slider_speed = Slider(ax_speed, 'Speed', 0.5, 5.0, valinit=1.5, color='#667EEA')
         self.slider_speed.on_changed(self.update_speed)
         
+        # Keyboard shortcuts for the same controls. In this figure they replace matplotlib's
+        # own bindings for these keys (log scale on 'l', view history on the arrows, home
+        # on 'r'): on_key takes over the default handler and passes on every other key
+        manager = self.fig.canvas.manager
+        self._pass_keys = manager is not None and manager.key_press_handler_id is not None
+        if self._pass_keys:
+            self.fig.canvas.mpl_disconnect(manager.key_press_handler_id)
+            manager.key_press_handler_id = None
+        self.fig.canvas.mpl_connect('key_press_event', self.on_key)
+        self.ax_controls.text(0.5, 0.5, '⌨ Space: Play/Pause   R: Reset   ←/→: Back/Next   '
+                              'L: Learn   +/-: Speed', ha='center', va='center',
+                              fontsize=10, color='#A0AEC0', transform=self.ax_controls.transAxes)
+        
         operation = self.config.get('operation', '').replace('_', ' ').title()
         structure = self.config.get('structure_type', '').replace('_', ' ').title()
         self.fig.suptitle(f'🎯 {structure} - {operation}', fontsize=20, 
                          color=self.colors['text'], fontweight='bold', y=0.98)
     
+    def setup_panels(self):
+        """Create the panel artists once; updates only call set_text/set_width"""
+        # Text boxes redrawn every frame sit on plain panels, so their translucent
+        # look is baked into opaque colors instead of alpha-blended each blit
+        panel, bg = self.colors['panel_bg'], self.colors['bg']
+        self.ax_info.text(0.5, 0.95, '📊 Algorithm Info', ha='center', va='top',
+                         fontsize=11, fontweight='bold', color=self.colors['text'],
+                         transform=self.ax_info.transAxes)
+        self._info_step_txt = self.ax_info.text(
+            0.5, 0.70, '', ha='center', va='center', fontsize=10, color='#4299E1',
+            fontweight='bold', transform=self.ax_info.transAxes, animated=True,
+            bbox=dict(boxstyle='round,pad=0.5', facecolor=_flatten_alpha('#2D3748', 0.8, panel),
+                      edgecolor=_flatten_alpha('black', 0.8, panel)))
+        self._info_progress_txt = self.ax_info.text(
+            0.5, 0.50, '', ha='center', va='center',
+            fontsize=9, color='#48BB78', transform=self.ax_info.transAxes, animated=True)
+        self.ax_info.text(0.5, 0.30, 'Time Complexity', ha='center', va='center',
+                         fontsize=9, color='#A0AEC0', transform=self.ax_info.transAxes)
+        self._info_complexity_txt = self.ax_info.text(
+            0.5, 0.15, '', ha='center', va='center',
+            fontsize=12, color='#48BB78', fontweight='bold',
+            transform=self.ax_info.transAxes, animated=True,
+            bbox=dict(boxstyle='round,pad=0.4', facecolor=_flatten_alpha('#2D3748', 0.9, panel),
+                      edgecolor=_flatten_alpha('black', 0.9, panel)))
+        
+        self.ax_stats.text(0.5, 0.95, '📈 Live Statistics', ha='center', va='top',
+                          fontsize=11, fontweight='bold', color=self.colors['text'],
+                          transform=self.ax_stats.transAxes)
+        self._stat_value_txts = []
+        y_pos = 0.65
+        for label, color in [('Comparisons', '#4299E1'), ('Swaps', '#48BB78'),
+                             ('Inserts', '#ECC94B'), ('Steps', '#9F7AEA')]:
+            self.ax_stats.text(0.15, y_pos, f'{label}:', ha='left', va='center',
+                              fontsize=9, color='#CBD5E0', transform=self.ax_stats.transAxes)
+            self._stat_value_txts.append(self.ax_stats.text(
+                0.85, y_pos, '', ha='right', va='center',
+                fontsize=11, fontweight='bold', color=color,
+                transform=self.ax_stats.transAxes, animated=True))
+            y_pos -= 0.25
+        
+        # Same geometry barh(0, w, height=0.5) produced in axes coordinates
+        self.ax_progress.add_patch(Rectangle((0, -0.25), 1, 0.5, facecolor='#2D3748', alpha=0.5,
+                                             transform=self.ax_progress.transAxes))
+        self._progress_rect = Rectangle((0, -0.25), 0, 0.5, facecolor='#48BB78', alpha=0.9,
+                                        transform=self.ax_progress.transAxes, animated=True)
+        self.ax_progress.add_patch(self._progress_rect)
+        self._progress_txt = self.ax_progress.text(
+            0.5, 0, '', ha='center', va='center',
+            fontsize=10, color='#F7FAFC', fontweight='bold',
+            transform=self.ax_progress.transAxes, animated=True)
+        
+        self._learn_title_txt = self.ax_learn.text(
+            0.02, 0.85, '💡 Learning Mode - What\'s Happening?',
+            ha='left', va='top', fontsize=12, fontweight='bold',
+            color='#ECC94B', transform=self.ax_learn.transAxes, visible=False, animated=True)
+        self._learn_body_txt = self.ax_learn.text(
+            0.05, 0.55, '', ha='left', va='top',
+            fontsize=10, color='#E2E8F0',
+            transform=self.ax_learn.transAxes, visible=False, animated=True,
+            bbox=dict(boxstyle='round,pad=0.8', facecolor=_flatten_alpha('#1A202C', 0.9, bg),
+                      edgecolor=_flatten_alpha('black', 0.9, bg)))
+        
+        self.ax_code.text(0.02, 0.92, '< Code />', ha='left', va='top',
+                         fontsize=11, fontweight='bold', color='#4299E1',
+                         transform=self.ax_code.transAxes)
+        # All code lines in one artist; linespacing 1.46 keeps the old 0.12-axes line pitch
+        self._code_txt = self.ax_code.text(
+            0.05, 0.75, '', ha='left', va='top', linespacing=1.46,
+            fontsize=8, color='#48BB78', family='monospace',
+            transform=self.ax_code.transAxes, animated=True)
+        
+        # Buttons recolor on hover; _blit repaints their face, frame and label, since
+        # Button's own blit would leave out the animated label
+        self._buttons = (self.btn_play, self.btn_reset, self.btn_back, self.btn_forward,
+                         self.btn_learn)
+        button_groups = {btn.ax: [btn.ax.patch, *btn.ax.spines.values(), btn.label]
+                         for btn in self._buttons}
+        for btn in self._buttons:
+            btn.drawon = False
+            for artist in button_groups[btn.ax]:
+                artist.set_animated(True)
+        self._button_faces = {btn: btn.ax.get_facecolor() for btn in self._buttons}
+        self.fig.canvas.mpl_connect('motion_notify_event', self._on_hover)
+        
+        # Everything _blit repaints over the cached background, in drawing order
+        # The progress frame overlaps the bar, so it must be repainted on top of it
+        progress_spines = list(self.ax_progress.spines.values())
+        for spine in progress_spines:
+            spine.set_animated(True)
+        self._panel_artists = [
+            self._info_step_txt, self._info_progress_txt, self._info_complexity_txt,
+            *self._stat_value_txts, self._progress_rect, *progress_spines, self._progress_txt,
+            self._learn_title_txt, self._learn_body_txt, self._code_txt,
+        ]
+        # Per owning axes; an Axes' own patch has no .axes, so buttons are grouped by hand
+        self._panel_groups = {}
+        for artist in self._panel_artists:
+            self._panel_groups.setdefault(artist.axes, []).append(artist)
+        self._panel_groups.update(button_groups)
+        self._panel_artists += [a for artists in button_groups.values() for a in artists]
+    
+    def _on_hover(self, event):
+        """Blit the buttons whose hover color Button just changed"""
+        for btn in self._buttons:
+            face = btn.ax.get_facecolor()
+            if face != self._button_faces[btn]:
+                self._button_faces[btn] = face
+                self._dirty_axes.add(btn.ax)
+        if self._dirty_axes:
+            self._blit()
+    
+    def _on_draw(self, event):
+        """Full redraw: cache the static background, then paint the animated artists"""
+        if not self._can_blit or self.fig.canvas.is_saving():
+            # savefig renders animated artists itself and may resize the buffer
+            self._bg = None
+            return
+        self._bg = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        groups = self._animated_groups()
+        for artists in groups.values():
+            for artist in artists:
+                self.fig.draw_artist(artist)
+        self._regions = {ax: self._artists_region(ax, artists) for ax, artists in groups.items()}
+        self._dirty_axes.clear()
+    
+    def _animated_groups(self):
+        """Animated artists per owning axes, in drawing order (ax_main first)"""
+        main = [a for a in self.ax_main.get_children() if a.get_animated()]
+        main.sort(key=lambda a: a.get_zorder())
+        return {self.ax_main: main, **self._panel_groups}
+    
+    def _artists_region(self, ax, artists):
+        """Pixel area painted by an axes' animated artists; texts and ticks may spill outside it"""
+        renderer = self.fig.canvas.get_renderer()
+        boxes = [ax.bbox]
+        for artist in artists:
+            if isinstance(artist, Axis) and artist.get_visible():
+                tick_box = artist.get_tightbbox(renderer)
+                if tick_box is not None:
+                    boxes.append(tick_box)
+            elif isinstance(artist, Text) and artist.get_visible():
+                boxes.append(artist.get_window_extent(renderer))
+                if artist.get_bbox_patch() is not None:
+                    artist.update_bbox_position_size(renderer)
+                    boxes.append(artist.get_bbox_patch().get_window_extent(renderer))
+        # Pad for stroke widths and antialiasing, then snap to whole pixels
+        x0, y0, x1, y1 = Bbox.union(boxes).padded(4).extents
+        fx0, fy0, fx1, fy1 = self.fig.bbox.extents
+        return Bbox([[max(np.floor(x0), fx0), max(np.floor(y0), fy0)],
+                     [min(np.ceil(x1), fx1), min(np.ceil(y1), fy1)]])
+    
+    def _blit(self):
+        """Repaint the animated artists of the dirty axes over the cached background"""
+        if self.export_path:
+            # Blitting only helps the interactive window; export frames come from savefig
+            return
+        if self._bg is None:
+            self.fig.canvas.draw_idle()
+            return
+        
+        groups = self._animated_groups()
+        dirty = self._dirty_axes & groups.keys()
+        self._dirty_axes.clear()
+        # Old and new footprint, so whatever the artists covered before is erased
+        current = dict(self._regions)
+        for ax in dirty:
+            current[ax] = self._artists_region(ax, groups[ax])
+        regions = {ax: Bbox.union([self._regions.get(ax, current[ax]), current[ax]])
+                   for ax in dirty}
+        # A clean axes under a restored area would be wiped - repaint it too
+        changed = True
+        while changed:
+            changed = False
+            for ax in groups:
+                if ax not in regions and any(current[ax].overlaps(r) for r in regions.values()):
+                    regions[ax] = current[ax]
+                    changed = True
+        if not regions:
+            return
+        
+        height = self.fig.bbox.height
+        origin = self._bg.get_extents()[:2]
+        for x0, y0, x1, y1 in (r.extents for r in regions.values()):
+            # Sub-areas of a saved region are given in buffer rows, counted from the top
+            self.fig.canvas.restore_region(self._bg, bbox=(x0, height - y1, x1, height - y0),
+                                           xy=origin)
+        for ax, artists in groups.items():
+            if ax in regions:
+                for artist in artists:
+                    self.fig.draw_artist(artist)
+        for region in regions.values():
+            self.fig.canvas.blit(region)
+        self._regions = current
+    
+    def pick_visualizer(self):
+        """Choose the main view from the config once, not on every frame"""
+        structure = self.config.get('structure_type', 'array')
+        
+        if self.is_sorting_algorithm():
+            return self.visualize_sorting_bars
+        elif structure == 'stack' or self.config.get('is_stack', False):
+            return self.visualize_stack_vertical
+        elif structure == 'queue' or self.config.get('is_queue', False):
+            return self.visualize_queue_horizontal
+        elif structure == 'linked_list' or self.config.get('is_linked_list', False):
+            return self.visualize_linked_list_proper
+        elif structure == 'binary_search_tree' or self.config.get('is_binary_search_tree', False):
+            return self.visualize_binary_search_tree
+        return self.visualize_sorting_bars
+    
     def is_sorting_algorithm(self):
         op = self.config.get('operation', '').lower()
         return any(s in op for s in ['bubble', 'selection', 'insertion', 'quick', 'merge', 'sort'])
     
-    def get_highlight_color(self, h):
-        """Map C highlight values to colors - EXACT match with C code"""
-        if h == 0:
-            return self.colors['accent']  # Default/unhighlighted
-        elif h == 1:
-            return self.colors['highlight_1']  # Red - comparing/current
-        elif h == 2:
-            return self.colors['highlight_2']  # Green - swapped/sorted
-        elif h == 3:
-            return self.colors['highlight_3']  # Yellow - pivot/selected
-        elif h == 4:
-            return self.colors['highlight_4']  # Purple - merged
-        else:
-            return self.colors['accent']
+    def _step_arrays(self, index):
+        """(values, styles) of a step as views into the packed buffers; styles is
+        the 2 x n (palette index, outline index) of its highlights, all plain when
+        the step has none"""
+        vo, ho = self._value_offsets, self._highlight_offsets
+        return (self._values[vo[index]:vo[index + 1]],
+                self._highlight_styles[:, ho[index]:ho[index + 1]])
     
-    def visualize_sorting_bars(self, step):
-        """BAR FORMAT - Exact visualization of C sorting algorithms"""
+    def _set_main_limits(self, xlim=None, ylim=None):
+        """Apply view limits only when they differ from the current ones"""
+        if xlim is not None and tuple(xlim) != self.ax_main.get_xlim():
+            self.ax_main.set_xlim(*xlim)
+        if ylim is not None and tuple(ylim) != self.ax_main.get_ylim():
+            self.ax_main.set_ylim(*ylim)
+    
+    def _animate_main(self):
+        """After ax_main is (re)built: blit all of it but the plain background"""
+        if self._can_blit:
+            for artist in self.ax_main.get_children():
+                if artist is not self.ax_main.patch:
+                    artist.set_animated(True)
+    
+    def _clear_main(self):
         self.ax_main.clear()
-        data = step['data']
-        highlighted = step.get('highlighted', [0] * len(data))
-        pointers = step.get('pointers', [-1] * 10)
-        action = step.get('action', '')
-        
-        if not data:
-            self.ax_main.text(0.5, 0.5, 'No Data', ha='center', va='center',
-                            transform=self.ax_main.transAxes, fontsize=20, color='white')
-            return
+        self._main_view = None
+    
+    def _build_bar_artists(self, n, n_bars):
+        """Create the sorting-bar artists for n values; frames only mutate them"""
+        self._clear_main()
+        bar_width = 0.8
         
-        n = len(data)
-        max_val, min_val = max(data), min(data)
-        value_range = max_val - min_val if max_val != min_val else 1
+        self._bar_coll = PolyCollection(np.zeros((n_bars, 4, 2)), alpha=0.9,
+                                        joinstyle='miter', zorder=3)
+        self.ax_main.add_collection(self._bar_coll, autolim=False)
         
-        bar_width = 0.8
-        for i, (value, h) in enumerate(zip(data, highlighted)):
-            normalized = (value - min_val) / value_range
-            bar_height = 0.5 + normalized * 5.0
-            
-            color = self.get_highlight_color(h)
-            edge_color = '#FFFFFF' if h != 0 else '#4A5568'
-            edge_width = 3 if h != 0 else 1.5
-            
-            rect = Rectangle((i, 0), bar_width, bar_height, facecolor=color, alpha=0.9,
-                           edgecolor=edge_color, linewidth=edge_width, zorder=3)
-            self.ax_main.add_patch(rect)
-            
-            self.ax_main.text(i + bar_width/2, bar_height + 0.2, str(value),
-                            ha='center', va='bottom', fontsize=11, fontweight='bold',
-                            color='white', zorder=4)
+        self._bar_value_txts = []
+        for i in range(n_bars):
+            self._bar_value_txts.append(self.ax_main.text(
+                i + bar_width/2, 0, '', ha='center', va='bottom', fontsize=11,
+                fontweight='bold', color='white', zorder=4))
             self.ax_main.text(i + bar_width/2, -0.3, f'[{i}]', ha='center', va='top',
                             fontsize=9, color='#A0AEC0')
         
@@ -182,53 +920,102 @@ class AlgorithmVisualizer:
             (1, 'R', self.colors['pivot']),       # Right pointer
             (2, 'P', self.colors['comparing'])    # Pivot/Mid pointer
         ]
-        
+        self._pointer_anns = []
         for idx, symbol, col in pointer_labels:
-            if pointers[idx] != -1 and pointers[idx] < n:
-                x = pointers[idx] + bar_width/2
-                self.ax_main.annotate(symbol, xy=(x, 0), xytext=(x, 6.5),
-                                    arrowprops=dict(arrowstyle='->', color=col, lw=2.5),
-                                    fontsize=12, color=col, fontweight='bold', ha='center',
-                                    bbox=dict(boxstyle='circle,pad=0.3', facecolor=col, alpha=0.4))
-        
-        # Add action-specific annotations
-        if 'PIVOT' in action:
-            self.ax_main.text(0.98, 0.95, '🎯 Pivot Selected', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['pivot'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['pivot'], linewidth=2))
-        elif 'DIVIDE' in action:
-            self.ax_main.text(0.98, 0.95, '✂️ Dividing', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['active'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
-        elif 'MERGE' in action and 'COMPLETE' in action:
-            self.ax_main.text(0.98, 0.95, '✅ Merged', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['sorted'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['sorted'], linewidth=2))
+            # Kept translucent: markers on the same index stack and must show through
+            ann = self.ax_main.annotate(symbol, xy=(0, 0), xytext=(0, 6.5),
+                                        arrowprops=dict(arrowstyle='->', color=col, lw=2.5),
+                                        fontsize=12, color=col, fontweight='bold', ha='center',
+                                        bbox=dict(boxstyle='circle,pad=0.3', facecolor=col, alpha=0.4))
+            ann.set_visible(False)
+            self._pointer_anns.append((idx, ann))
+        
+        # Action-specific banner; text and colors are set per frame
+        self._bar_banner = self.ax_main.text(
+            0.98, 0.95, '', transform=self.ax_main.transAxes,
+            ha='right', va='top', fontsize=11, fontweight='bold', visible=False,
+            bbox=dict(boxstyle='round,pad=0.5', facecolor=self.colors['panel_bg'], linewidth=2))
         
         self.ax_main.set_xlim(-0.5, n)
         self.ax_main.set_ylim(-0.5, 7.0)
         self.ax_main.set_xticks([])
         self.ax_main.set_yticks([])
         self.ax_main.grid(axis='y', alpha=0.15, linestyle='--', linewidth=0.5)
-        self.ax_main.set_title(step.get('description', ''), fontsize=13, 
-                              color=self.colors['text'], pad=15, fontweight='bold')
+        self.ax_main.set_title('', fontsize=13, color=self.colors['text'], pad=15, fontweight='bold')
+        self._main_view = ('bars', n, n_bars)
+        self._animate_main()
     
-    def visualize_stack_vertical(self, step):
-        """VERTICAL STACK - LIFO visualization"""
-        self.ax_main.clear()
+    def visualize_sorting_bars(self, step):
+        """BAR FORMAT - Exact visualization of C sorting algorithms"""
         data = step['data']
-        highlighted = step.get('highlighted', [0] * len(data))
-        pointers = step.get('pointers', [-1] * 10)
+        pointers = self._pointers[self.current_step]
+        kind = self._action_kind[self.current_step]
         
         if not data:
-            self.ax_main.text(0.5, 0.5, '📚 Stack Empty\nLIFO (Last In, First Out)',
-                            ha='center', va='center', transform=self.ax_main.transAxes,
-                            fontsize=18, fontweight='bold', color=self.colors['text'])
+            self._clear_main()
+            self.ax_main.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                            transform=self.ax_main.transAxes, fontsize=20, color='white')
+            self._animate_main()
             return
         
+        n = len(data)
+        bar_width = 0.8
+        # Bars stop at the shorter of data and highlighted
+        vo = self._value_offsets
+        _, styles = self._step_arrays(self.current_step)
+        n_bars = min(n, styles.shape[1])
+        heights = self._bar_heights[vo[self.current_step]:vo[self.current_step] + n_bars]
+        color_idx, outline_idx = styles[:, :n_bars]
+        
+        # Same-sized steps reuse the artists already in the axes
+        if self._main_view != ('bars', n, n_bars):
+            self._build_bar_artists(n, n_bars)
+        
+        # All bars as one collection: corners (x, 0) (x+w, 0) (x+w, h) (x, h)
+        verts = np.zeros((n_bars, 4, 2))
+        verts[:, :, 0] = np.arange(n_bars)[:, None] + np.array([0, bar_width, bar_width, 0])
+        verts[:, 2:, 1] = heights[:, None]
+        self._bar_coll.set_verts(verts)
+        self._bar_coll.set_facecolor(self._highlight_rgba[color_idx])
+        self._bar_coll.set_edgecolor(self._bar_edge_rgba[outline_idx])
+        self._bar_coll.set_linewidth(self._bar_edge_widths[outline_idx])
+        
+        for txt, value, bar_height in zip(self._bar_value_txts, data, heights):
+            txt.set_text(str(value))
+            txt.set_y(bar_height + 0.2)
+        
+        for idx, ann in self._pointer_anns:
+            shown = pointers[idx] != -1 and pointers[idx] < n
+            if shown:
+                x = pointers[idx] + bar_width/2
+                ann.xy = (x, 0)
+                ann.set_position((x, 6.5))
+            ann.set_visible(shown)
+        
+        # Add action-specific annotations
+        banner = None
+        if kind & ACTION_PIVOT:
+            banner = ('🎯 Pivot Selected', self.colors['pivot'])
+        elif kind & ACTION_DIVIDE:
+            banner = ('✂️ Dividing', self.colors['active'])
+        elif kind & ACTION_MERGED:
+            banner = ('✅ Merged', self.colors['sorted'])
+        if banner:
+            label, col = banner
+            self._bar_banner.set_text(label)
+            self._bar_banner.set_color(col)
+            self._bar_banner.get_bbox_patch().set_edgecolor(col)
+        self._bar_banner.set_visible(banner is not None)
+        
+        self.ax_main.title.set_text(step.get('description', ''))
+    
+    def _max_data_len(self):
+        """Longest data array over all steps; persistent views are sized to it"""
+        return int(np.diff(self._value_offsets).max())
+    
+    def _build_stack_artists(self, cap):
+        """Create the artists for up to cap stack slots; frames only mutate them"""
+        self._clear_main()
         box_h, box_w, base_y, cx = 0.6, 2.5, 1.0, 0.5
         
         # Draw base
@@ -239,259 +1026,393 @@ class AlgorithmVisualizer:
         self.ax_main.text(cx, base_y - 0.4, '⬛ BASE ⬛', ha='center', va='top',
                          fontsize=12, color='#E2E8F0', fontweight='bold')
         
-        # Draw stack elements
-        for i, (val, h) in enumerate(zip(data, highlighted)):
+        # All boxes as one collection, restyled from the highlight codes each frame
+        self._slot_boxes = [FancyBboxPatch((cx - box_w/2, base_y + i * (box_h + 0.1)), box_w, box_h,
+                                           boxstyle="round,pad=0.05") for i in range(cap)]
+        self._box_coll = PatchCollection([], alpha=0.9, zorder=3)
+        self.ax_main.add_collection(self._box_coll, autolim=False)
+        
+        # Value and index label per slot; slots above the top are hidden
+        self._stack_slots = []
+        for i in range(cap):
             y = base_y + i * (box_h + 0.1)
-            col = self.get_highlight_color(h)
-            edge_col = '#FFFFFF' if h != 0 else '#667EEA'
-            edge_w = 4 if h != 0 else 2
-            
-            box = FancyBboxPatch((cx - box_w/2, y), box_w, box_h, boxstyle="round,pad=0.05",
-                                facecolor=col, alpha=0.9, edgecolor=edge_col,
-                                linewidth=edge_w, zorder=3)
-            self.ax_main.add_patch(box)
-            
-            self.ax_main.text(cx, y + box_h/2, str(val), ha='center', va='center',
-                            fontsize=18, fontweight='bold', color='white', zorder=4)
-            self.ax_main.text(cx - box_w/2 - 0.4, y + box_h/2, f'{i}', ha='right',
-                            va='center', fontsize=11, color='#CBD5E0', fontweight='bold')
+            val_txt = self.ax_main.text(cx, y + box_h/2, '', ha='center', va='center',
+                                        fontsize=18, fontweight='bold', color='white', zorder=4)
+            idx_txt = self.ax_main.text(cx - box_w/2 - 0.4, y + box_h/2, f'{i}', ha='right',
+                                        va='center', fontsize=11, color='#CBD5E0', fontweight='bold')
+            self._stack_slots.append((val_txt, idx_txt))
+        
+        self._top_arrow = FancyArrowPatch((0, 0), (0, 0), arrowstyle='->', mutation_scale=30,
+                                          color=self.colors['comparing'], linewidth=4, zorder=5)
+        self.ax_main.add_patch(self._top_arrow)
+        self._top_label = self.ax_main.text(
+            cx + box_w/2 + 1.2, 0, '🔝 TOP', ha='left',
+            va='center', fontsize=14, color=self.colors['comparing'],
+            fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
+            facecolor=_flatten_alpha(self.colors['comparing'], 0.3, self.colors['panel_bg']),
+            edgecolor=_flatten_alpha(self.colors['comparing'], 0.3, self.colors['panel_bg']),
+            linewidth=2))
+        
+        self._size_txt = self.ax_main.text(
+            0.95, 0.95, '', transform=self.ax_main.transAxes,
+            ha='right', va='top', fontsize=13, color=self.colors['active'],
+            fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
+            facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
+        
+        self.ax_main.set_xlim(-1, 4)
+        self.ax_main.set_xticks([])
+        self.ax_main.set_yticks([])
+        self.ax_main.set_title('', fontsize=14, color=self.colors['text'], pad=15, fontweight='bold')
+        self._main_view = ('stack', cap)
+        self._animate_main()
+    
+    def visualize_stack_vertical(self, step):
+        """VERTICAL STACK - LIFO visualization"""
+        data = step['data']
+        _, styles = self._step_arrays(self.current_step)
+        pointers = self._pointers[self.current_step]
+        
+        if not data:
+            self._clear_main()
+            self.ax_main.text(0.5, 0.5, '📚 Stack Empty\nLIFO (Last In, First Out)',
+                            ha='center', va='center', transform=self.ax_main.transAxes,
+                            fontsize=18, fontweight='bold', color=self.colors['text'])
+            self._animate_main()
+            return
+        
+        box_h, box_w, base_y, cx = 0.6, 2.5, 1.0, 0.5
+        cap = self._max_data_len()
+        if self._main_view != ('stack', cap):
+            self._build_stack_artists(cap)
+        
+        # Update stack elements
+        shown = min(len(data), styles.shape[1])
+        self._box_coll.set_paths(self._slot_boxes[:shown])
+        self._style_nodes(self._box_coll, styles[:, :shown], self._list_edge_rgba)
+        for i, (val_txt, idx_txt) in enumerate(self._stack_slots):
+            visible = i < shown
+            if visible:
+                val_txt.set_text(str(data[i]))
+            val_txt.set_visible(visible)
+            idx_txt.set_visible(visible)
         
         # TOP pointer - matching C's pointer[0] for top
         top_idx = pointers[0] if pointers[0] != -1 else len(data) - 1
-        if top_idx >= 0 and top_idx < len(data):
+        has_top = 0 <= top_idx < len(data)
+        if has_top:
             top_y = base_y + top_idx * (box_h + 0.1) + box_h/2
-            arrow = FancyArrowPatch((cx + box_w/2 + 0.5, top_y),
-                                   (cx + box_w/2 + 0.1, top_y),
-                                   arrowstyle='->', mutation_scale=30, color=self.colors['comparing'],
-                                   linewidth=4, zorder=5)
-            self.ax_main.add_patch(arrow)
-            
-            self.ax_main.text(cx + box_w/2 + 1.2, top_y, '🔝 TOP', ha='left',
-                             va='center', fontsize=14, color=self.colors['comparing'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['comparing'], alpha=0.3,
-                             edgecolor=self.colors['comparing'], linewidth=2))
-        
-        self.ax_main.text(0.95, 0.95, f'📊 Size: {len(data)}', transform=self.ax_main.transAxes,
-                         ha='right', va='top', fontsize=13, color=self.colors['active'],
-                         fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                         facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
+            self._top_arrow.set_positions((cx + box_w/2 + 0.5, top_y),
+                                          (cx + box_w/2 + 0.1, top_y))
+            self._top_label.set_y(top_y)
+        self._top_arrow.set_visible(has_top)
+        self._top_label.set_visible(has_top)
+        
+        self._size_txt.set_text(f'📊 Size: {len(data)}')
         
         top_y = base_y + len(data) * (box_h + 0.1)
-        self.ax_main.set_xlim(-1, 4)
-        self.ax_main.set_ylim(0, top_y + 1)
+        self._set_main_limits(ylim=(0, top_y + 1))
+        self.ax_main.title.set_text(step.get('description', ''))
+    
+    def _build_queue_artists(self, cap):
+        """Create the artists for up to cap queue slots; frames only mutate them"""
+        self._clear_main()
+        box_w, box_h, start_x, cy, sp = 0.9, 1.2, 1.0, 0.5, 0.15
+        
+        # All boxes as one collection, restyled from the highlight codes each frame
+        self._slot_boxes = [FancyBboxPatch((start_x + i * (box_w + sp), cy - box_h/2), box_w, box_h,
+                                           boxstyle="round,pad=0.05") for i in range(cap)]
+        self._box_coll = PatchCollection([], alpha=0.9, zorder=3)
+        self.ax_main.add_collection(self._box_coll, autolim=False)
+        
+        # Value, index label and link arrow per slot; slots past the rear are hidden
+        self._queue_slots = []
+        for i in range(cap):
+            x = start_x + i * (box_w + sp)
+            val_txt = self.ax_main.text(x + box_w/2, cy, '', ha='center', va='center',
+                                        fontsize=18, fontweight='bold', color='white', zorder=4)
+            idx_txt = self.ax_main.text(x + box_w/2, cy - box_h/2 - 0.25, f'[{i}]', ha='center',
+                                        va='top', fontsize=10, color='#CBD5E0', fontweight='bold')
+            arrow = None
+            if i < cap - 1:
+                arrow = FancyArrowPatch((x + box_w, cy), (x + box_w + sp, cy),
+                                       arrowstyle='->', mutation_scale=25,
+                                       color=self.colors['link_arrow'], linewidth=3, zorder=2)
+                self.ax_main.add_patch(arrow)
+            self._queue_slots.append((val_txt, idx_txt, arrow))
+        
+        # FRONT pointer - matching C's pointers[0]; REAR - pointers[1]
+        faded = {col: _flatten_alpha(col, 0.3, self.colors['panel_bg'])
+                 for col in ('#F56565', '#48BB78')}
+        self._front_ann = self.ax_main.annotate(
+            '🔴 FRONT\n(Dequeue)', xy=(0, cy - box_h/2),
+            xytext=(0, cy - box_h/2 - 0.8),
+            arrowprops=dict(arrowstyle='->', color='#F56565', lw=4),
+            fontsize=12, color='#F56565', fontweight='bold', ha='center',
+            bbox=dict(boxstyle='round,pad=0.5', facecolor=faded['#F56565'],
+            edgecolor=faded['#F56565'], linewidth=2))
+        self._rear_ann = self.ax_main.annotate(
+            '🟢 REAR\n(Enqueue)', xy=(0, cy + box_h/2),
+            xytext=(0, cy + box_h/2 + 0.8),
+            arrowprops=dict(arrowstyle='->', color='#48BB78', lw=4),
+            fontsize=12, color='#48BB78', fontweight='bold', ha='center',
+            bbox=dict(boxstyle='round,pad=0.5', facecolor=faded['#48BB78'],
+            edgecolor=faded['#48BB78'], linewidth=2))
+        
+        self._size_txt = self.ax_main.text(
+            0.95, 0.95, '', transform=self.ax_main.transAxes,
+            ha='right', va='top', fontsize=13, color=self.colors['active'],
+            fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
+            facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
+        
+        self.ax_main.set_ylim(-2, 3)
         self.ax_main.set_xticks([])
         self.ax_main.set_yticks([])
-        self.ax_main.set_title(step.get('description', ''), fontsize=14,
-                              color=self.colors['text'], pad=15, fontweight='bold')
+        self.ax_main.set_title('', fontsize=14, color=self.colors['text'], pad=15, fontweight='bold')
+        self._main_view = ('queue', cap)
+        self._animate_main()
     
     def visualize_queue_horizontal(self, step):
         """HORIZONTAL QUEUE - FIFO visualization"""
-        self.ax_main.clear()
         data = step['data']
-        highlighted = step.get('highlighted', [0] * len(data))
-        pointers = step.get('pointers', [-1] * 10)
+        _, styles = self._step_arrays(self.current_step)
+        pointers = self._pointers[self.current_step]
         
         if not data:
+            self._clear_main()
             self.ax_main.text(0.5, 0.5, '🎫 Queue Empty\nFIFO (First In, First Out)',
                             ha='center', va='center', transform=self.ax_main.transAxes,
                             fontsize=18, fontweight='bold', color=self.colors['text'])
+            self._animate_main()
             return
         
         box_w, box_h, start_x, cy, sp = 0.9, 1.2, 1.0, 0.5, 0.15
+        cap = self._max_data_len()
+        if self._main_view != ('queue', cap):
+            self._build_queue_artists(cap)
+        
+        shown = min(len(data), styles.shape[1])
+        self._box_coll.set_paths(self._slot_boxes[:shown])
+        self._style_nodes(self._box_coll, styles[:, :shown], self._list_edge_rgba)
+        for i, (val_txt, idx_txt, arrow) in enumerate(self._queue_slots):
+            visible = i < shown
+            if visible:
+                val_txt.set_text(str(data[i]))
+            val_txt.set_visible(visible)
+            idx_txt.set_visible(visible)
+            if arrow is not None:
+                arrow.set_visible(i < min(shown, len(data) - 1))
+        
+        for ann, idx in ((self._front_ann, pointers[0] if pointers[0] != -1 else 0),
+                         (self._rear_ann, pointers[1] if pointers[1] != -1 else len(data) - 1)):
+            has_idx = 0 <= idx < len(data)
+            if has_idx:
+                x = start_x + idx * (box_w + sp) + box_w/2
+                ann.xy = (x, ann.xy[1])
+                ann.set_x(x)
+            ann.set_visible(has_idx)
+        
+        self._size_txt.set_text(f'📊 Size: {len(data)}')
         
-        for i, (val, h) in enumerate(zip(data, highlighted)):
-            x = start_x + i * (box_w + sp)
-            col = self.get_highlight_color(h)
-            edge_col = '#FFFFFF' if h != 0 else '#667EEA'
-            edge_w = 4 if h != 0 else 2
-            
-            box = FancyBboxPatch((x, cy - box_h/2), box_w, box_h, boxstyle="round,pad=0.05",
-                                facecolor=col, alpha=0.9, edgecolor=edge_col,
-                                linewidth=edge_w, zorder=3)
-            self.ax_main.add_patch(box)
-            
-            self.ax_main.text(x + box_w/2, cy, str(val), ha='center', va='center',
-                            fontsize=18, fontweight='bold', color='white', zorder=4)
-            self.ax_main.text(x + box_w/2, cy - box_h/2 - 0.25, f'[{i}]', ha='center',
-                            va='top', fontsize=10, color='#CBD5E0', fontweight='bold')
-            
-            if i < len(data) - 1:
-                arrow = FancyArrowPatch((x + box_w, cy), (x + box_w + sp, cy),
-                                       arrowstyle='->', mutation_scale=25,
-                                       color=self.colors['link_arrow'], linewidth=3, zorder=2)
-                self.ax_main.add_patch(arrow)
+        total_w = start_x + len(data) * (box_w + sp) + 1
+        self._set_main_limits(xlim=(0, total_w))
+        self.ax_main.title.set_text(step.get('description', ''))
+    
+    def _build_list_artists(self, cap):
+        """Create the artists for up to cap list nodes; frames only mutate them"""
+        self._clear_main()
+        node_r, arrow_len, y_c, start_x = 0.35, 0.8, 0.5, 1.0
+        
+        # All nodes as one collection, restyled from the highlight codes each frame
+        self._list_nodes = [Circle((start_x + i * (node_r * 2 + arrow_len), y_c), node_r)
+                            for i in range(cap)]
+        self._node_coll = PatchCollection([], alpha=0.9, zorder=3)
+        self.ax_main.add_collection(self._node_coll, autolim=False)
+        
+        # 'next' links: every shaft in one LineCollection, every head in one scatter
+        arrow_s = start_x + np.arange(max(cap - 1, 0)) * (node_r * 2 + arrow_len) + node_r
+        arrow_e = arrow_s + arrow_len
+        self._link_segments = np.stack([np.column_stack([arrow_s, np.full_like(arrow_s, y_c)]),
+                                        np.column_stack([arrow_e, np.full_like(arrow_e, y_c)])],
+                                       axis=1)
+        self._link_shafts = LineCollection([], colors=self.colors['link_arrow'],
+                                           linewidths=3.5, zorder=2)
+        self.ax_main.add_collection(self._link_shafts, autolim=False)
+        self._link_heads = self.ax_main.scatter(
+            [], [], marker=_ARROW_HEAD, s=_ARROW_HEAD_SIZE, facecolors='none',
+            linewidths=3.5, joinstyle='round', zorder=2)
+        # Colors given to an empty scatter don't broadcast to later offsets
+        self._link_heads.set_edgecolor(self.colors['link_arrow'])
+        
+        # Per slot: value, label, and the 'next' label of the link to the following slot
+        self._list_slots = []
+        for i in range(cap):
+            x_c = start_x + i * (node_r * 2 + arrow_len)
+            val_txt = self.ax_main.text(x_c, y_c, '', ha='center', va='center',
+                                        fontsize=16, fontweight='bold', color='white', zorder=4)
+            label_txt = self.ax_main.text(x_c, y_c - node_r - 0.25, f'Node {i}', ha='center',
+                                          va='top', fontsize=10, color='#CBD5E0', fontweight='bold')
+            next_txt = None
+            if i < cap - 1:
+                next_txt = self.ax_main.text(x_c + node_r + arrow_len/2, y_c + 0.15, 'next',
+                                             ha='center', va='bottom', fontsize=9,
+                                             color=self.colors['link_arrow'], style='italic')
+            self._list_slots.append((val_txt, label_txt, next_txt))
         
-        # FRONT pointer - matching C's pointers[0]
-        front_idx = pointers[0] if pointers[0] != -1 else 0
-        if front_idx >= 0 and front_idx < len(data):
-            front_x = start_x + front_idx * (box_w + sp) + box_w/2
-            self.ax_main.annotate('🔴 FRONT\n(Dequeue)', xy=(front_x, cy - box_h/2),
-                                xytext=(front_x, cy - box_h/2 - 0.8),
-                                arrowprops=dict(arrowstyle='->', color='#F56565', lw=4),
-                                fontsize=12, color='#F56565', fontweight='bold', ha='center',
-                                bbox=dict(boxstyle='round,pad=0.5', facecolor='#F56565',
-                                alpha=0.3, edgecolor='#F56565', linewidth=2))
-        
-        # REAR pointer - matching C's pointers[1]
-        rear_idx = pointers[1] if pointers[1] != -1 else len(data) - 1
-        if rear_idx >= 0 and rear_idx < len(data):
-            rear_x = start_x + rear_idx * (box_w + sp) + box_w/2
-            self.ax_main.annotate('🟢 REAR\n(Enqueue)', xy=(rear_x, cy + box_h/2),
-                                xytext=(rear_x, cy + box_h/2 + 0.8),
-                                arrowprops=dict(arrowstyle='->', color='#48BB78', lw=4),
-                                fontsize=12, color='#48BB78', fontweight='bold', ha='center',
-                                bbox=dict(boxstyle='round,pad=0.5', facecolor='#48BB78',
-                                alpha=0.3, edgecolor='#48BB78', linewidth=2))
-        
-        self.ax_main.text(0.95, 0.95, f'📊 Size: {len(data)}', transform=self.ax_main.transAxes,
-                         ha='right', va='top', fontsize=13, color=self.colors['active'],
-                         fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                         facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
+        # HEAD pointer
+        head_x = start_x
+        head_col = _flatten_alpha('#F56565', 0.3, self.colors['panel_bg'])
+        self.ax_main.annotate('🎯 HEAD', xy=(head_x, y_c), xytext=(head_x - 0.8, y_c + 0.8),
+                            arrowprops=dict(arrowstyle='->', color='#F56565', lw=4),
+                            fontsize=13, color='#F56565', fontweight='bold', ha='center',
+                            bbox=dict(boxstyle='round,pad=0.5', facecolor=head_col,
+                            edgecolor=head_col, linewidth=2))
+        
+        # NULL at end; moved behind the last node every frame
+        self._null_box = FancyBboxPatch((0, y_c - 0.15), 0.5, 0.3,
+                                        boxstyle="round,pad=0.05", facecolor='#1A202C',
+                                        edgecolor='#F56565', linewidth=2, zorder=3)
+        self.ax_main.add_patch(self._null_box)
+        self._null_txt = self.ax_main.text(0, y_c, 'NULL', ha='center', va='center',
+                                           fontsize=10, color='#F56565', fontweight='bold')
+        self._null_arrow = FancyArrowPatch((0, y_c), (0, y_c), arrowstyle='->',
+                                           mutation_scale=20, color=self.colors['link_arrow'],
+                                           linewidth=3, zorder=2)
+        self.ax_main.add_patch(self._null_arrow)
+        
+        self._node_count_txt = self._add_node_count_text()
         
-        total_w = start_x + len(data) * (box_w + sp) + 1
-        self.ax_main.set_xlim(0, total_w)
-        self.ax_main.set_ylim(-2, 3)
+        self.ax_main.set_ylim(-0.5, 2)
         self.ax_main.set_xticks([])
         self.ax_main.set_yticks([])
-        self.ax_main.set_title(step.get('description', ''), fontsize=14,
-                              color=self.colors['text'], pad=15, fontweight='bold')
+        self.ax_main.set_title('', fontsize=14, color=self.colors['text'], pad=15, fontweight='bold')
+        self._main_view = ('list', cap)
+        self._animate_main()
     
     def visualize_linked_list_proper(self, step):
         """PROPER LINKED LIST with nodes and arrows"""
-        self.ax_main.clear()
         data = step['data']
-        highlighted = step.get('highlighted', [0] * len(data))
+        _, styles = self._step_arrays(self.current_step)
         
         if not data:
+            self._clear_main()
             self.ax_main.text(0.5, 0.5, '🔗 List Empty', ha='center', va='center',
                             transform=self.ax_main.transAxes, fontsize=22,
                             fontweight='bold', color=self.colors['text'])
+            self._animate_main()
             return
         
         node_r, arrow_len, y_c, start_x = 0.35, 0.8, 0.5, 1.0
+        cap = self._max_data_len()
+        if self._main_view != ('list', cap):
+            self._build_list_artists(cap)
+        
+        n = min(len(data), styles.shape[1])
+        self._node_coll.set_paths(self._list_nodes[:n])
+        self._style_nodes(self._node_coll, styles[:, :n], self._list_edge_rgba)
+        labeled = self._update_node_count(n)
+        
+        n_links = max(min(n, len(data) - 1), 0)
+        self._link_shafts.set_segments(self._link_segments[:n_links])
+        self._link_heads.set_offsets(self._link_segments[:n_links, 1])
+        
+        for i, (val_txt, label_txt, next_txt) in enumerate(self._list_slots):
+            visible = i < n
+            if visible and labeled:
+                val_txt.set_text(str(data[i]))
+            val_txt.set_visible(visible and labeled)
+            label_txt.set_visible(visible and labeled)
+            if next_txt is not None:
+                next_txt.set_visible(labeled and i < n_links)
         
-        for i, (val, h) in enumerate(zip(data, highlighted)):
-            x_c = start_x + i * (node_r * 2 + arrow_len)
-            col = self.get_highlight_color(h)
-            edge_col = '#FFFFFF' if h != 0 else '#667EEA'
-            edge_w = 4 if h != 0 else 2
-            
-            circle = Circle((x_c, y_c), node_r, facecolor=col, alpha=0.9,
-                          edgecolor=edge_col, linewidth=edge_w, zorder=3)
-            self.ax_main.add_patch(circle)
-            
-            self.ax_main.text(x_c, y_c, str(val), ha='center', va='center',
-                            fontsize=16, fontweight='bold', color='white', zorder=4)
-            self.ax_main.text(x_c, y_c - node_r - 0.25, f'Node {i}', ha='center',
-                            va='top', fontsize=10, color='#CBD5E0', fontweight='bold')
-            
-            if i < len(data) - 1:
-                arrow_s = x_c + node_r
-                arrow_e = start_x + (i + 1) * (node_r * 2 + arrow_len) - node_r
-                arrow = FancyArrowPatch((arrow_s, y_c), (arrow_e, y_c), arrowstyle='->',
-                                       mutation_scale=25, color=self.colors['link_arrow'],
-                                       linewidth=3.5, zorder=2)
-                self.ax_main.add_patch(arrow)
-                self.ax_main.text((arrow_s + arrow_e)/2, y_c + 0.15, 'next', ha='center',
-                                va='bottom', fontsize=9, color=self.colors['link_arrow'],
-                                style='italic')
-        
-        # HEAD pointer
-        head_x = start_x
-        self.ax_main.annotate('🎯 HEAD', xy=(head_x, y_c), xytext=(head_x - 0.8, y_c + 0.8),
-                            arrowprops=dict(arrowstyle='->', color='#F56565', lw=4),
-                            fontsize=13, color='#F56565', fontweight='bold', ha='center',
-                            bbox=dict(boxstyle='round,pad=0.5', facecolor='#F56565',
-                            alpha=0.3, edgecolor='#F56565', linewidth=2))
-        
-        # NULL at end
         last_x = start_x + (len(data) - 1) * (node_r * 2 + arrow_len) + node_r
-        null_box = FancyBboxPatch((last_x + 0.2, y_c - 0.15), 0.5, 0.3,
-                                 boxstyle="round,pad=0.05", facecolor='#1A202C',
-                                 edgecolor='#F56565', linewidth=2, zorder=3)
-        self.ax_main.add_patch(null_box)
-        self.ax_main.text(last_x + 0.45, y_c, 'NULL', ha='center', va='center',
-                         fontsize=10, color='#F56565', fontweight='bold')
-        
-        arrow = FancyArrowPatch((last_x, y_c), (last_x + 0.2, y_c), arrowstyle='->',
-                               mutation_scale=20, color=self.colors['link_arrow'],
-                               linewidth=3, zorder=2)
-        self.ax_main.add_patch(arrow)
+        self._null_box.set_x(last_x + 0.2)
+        self._null_txt.set_x(last_x + 0.45)
+        self._null_arrow.set_positions((last_x, y_c), (last_x + 0.2, y_c))
         
         total_w = start_x + len(data) * (node_r * 2 + arrow_len) + 1.5
-        self.ax_main.set_xlim(-0.5, total_w)
-        self.ax_main.set_ylim(-0.5, 2)
+        self._set_main_limits(xlim=(-0.5, total_w))
+        self.ax_main.title.set_text(step.get('description', ''))
+    
+    def _build_tree_artists(self, cap):
+        """Create the artists for up to cap tree nodes; frames only mutate them"""
+        self._clear_main()
+        self._edge_coll = LineCollection([], colors=self.colors['link_arrow'], linewidths=2.5,
+                                         alpha=0.7, capstyle='projecting', zorder=1)
+        self.ax_main.add_collection(self._edge_coll, autolim=False)
+        self._node_coll = PatchCollection([], alpha=0.9, zorder=3)
+        self.ax_main.add_collection(self._node_coll, autolim=False)
+        self._tree_value_txts = [
+            self.ax_main.text(0, 0, '', ha='center', va='center', fontsize=12,
+                              fontweight='bold', color='white', zorder=4, visible=False)
+            for _ in range(cap)
+        ]
+        
+        # Action-specific banner; text and colors are set per frame
+        self._tree_banner = self.ax_main.text(
+            0.98, 0.95, '', transform=self.ax_main.transAxes,
+            ha='right', va='top', fontsize=11, fontweight='bold', visible=False,
+            bbox=dict(boxstyle='round,pad=0.5', facecolor=self.colors['panel_bg'], linewidth=2))
+        self._node_count_txt = self._add_node_count_text()
+        
         self.ax_main.set_xticks([])
         self.ax_main.set_yticks([])
-        self.ax_main.set_title(step.get('description', ''), fontsize=14,
-                              color=self.colors['text'], pad=15, fontweight='bold')
+        self.ax_main.set_title('', fontsize=14, color=self.colors['text'], pad=15, fontweight='bold')
+        self._main_view = ('tree', cap)
+        self._animate_main()
     
     def visualize_binary_search_tree(self, step):
         """BST TREE - PROPER BST STRUCTURE visualization"""
-        self.ax_main.clear()
         data = step['data']
-        highlighted = step.get('highlighted', [0] * len(data))
-        action = step.get('action', '')
+        _, styles = self._step_arrays(self.current_step)
+        kind = self._action_kind[self.current_step]
         
         if not data:
+            self._clear_main()
             self.ax_main.text(0.5, 0.5, '🌳 BST Empty', ha='center', va='center',
                             transform=self.ax_main.transAxes, fontsize=22,
                             fontweight='bold', color=self.colors['text'])
+            self._animate_main()
             return
         
+        cap = self._max_data_len()
+        if self._main_view != ('tree', cap):
+            self._build_tree_artists(cap)
+        
         # Calculate positions for proper BST structure
         positions, edges = self.calculate_bst_positions(data)
         
-        # Draw edges first (tree connections) based on actual BST relationships
-        for parent_idx, child_idx in edges:
-            if parent_idx >= len(positions) or child_idx >= len(positions):
-                continue
-            parent_pos = positions[parent_idx]
-            child_pos = positions[child_idx]
-            if parent_pos is None or child_pos is None:
-                continue
-
-            self.ax_main.plot(
-                [parent_pos[0], child_pos[0]],
-                [parent_pos[1], child_pos[1]],
-                color=self.colors['link_arrow'],
-                linewidth=2.5,
-                alpha=0.7,
-                zorder=1,
-            )
-        
-        # Draw nodes
-        for i, (val, h) in enumerate(zip(data, highlighted)):
-            if positions[i] is not None:
-                x, y = positions[i]
-                col = self.get_highlight_color(h)
-                edge_col = '#FFFFFF' if h != 0 else '#9F7AEA'
-                edge_w = 4 if h != 0 else 2
-                
-                circle = Circle((x, y), 0.2, facecolor=col, alpha=0.9,
-                              edgecolor=edge_col, linewidth=edge_w, zorder=3)
-                self.ax_main.add_patch(circle)
-                
-                self.ax_main.text(x, y, str(val), ha='center', va='center',
-                                fontsize=12, fontweight='bold', color='white', zorder=4)
+        # Tree connections based on actual BST relationships
+        self._edge_coll.set_segments([(positions[p], positions[c]) for p, c in edges
+                                      if p < len(positions) and c < len(positions)
+                                      and positions[p] is not None and positions[c] is not None])
+        
+        # Nodes that found their place in the tree
+        n = min(len(data), styles.shape[1])
+        placed = [i for i in range(n) if positions[i] is not None]
+        self._node_coll.set_paths([Circle(positions[i], 0.2) for i in placed])
+        self._style_nodes(self._node_coll, styles[:, placed], self._tree_edge_rgba)
+        labeled = self._update_node_count(len(placed))
+        for txt in self._tree_value_txts[len(placed) if labeled else 0:]:
+            txt.set_visible(False)
+        for txt, i in zip(self._tree_value_txts, placed if labeled else ()):
+            txt.set_position(positions[i])
+            txt.set_text(str(data[i]))
+            txt.set_visible(True)
         
         # Add BST-specific annotations based on action
-        if 'INSERT' in action:
-            self.ax_main.text(0.98, 0.95, '🌱 Inserting Node', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['sorted'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['sorted'], linewidth=2))
-        elif 'DELETE' in action:
-            self.ax_main.text(0.98, 0.95, '🗑️ Deleting Node', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['comparing'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['comparing'], linewidth=2))
-        elif 'INORDER' in action:
-            self.ax_main.text(0.98, 0.95, '📈 Inorder Traversal', transform=self.ax_main.transAxes,
-                             ha='right', va='top', fontsize=11, color=self.colors['active'],
-                             fontweight='bold', bbox=dict(boxstyle='round,pad=0.5',
-                             facecolor=self.colors['panel_bg'], edgecolor=self.colors['active'], linewidth=2))
+        banner = None
+        if kind & ACTION_INSERT:
+            banner = ('🌱 Inserting Node', self.colors['sorted'])
+        elif kind & ACTION_DELETE:
+            banner = ('🗑️ Deleting Node', self.colors['comparing'])
+        elif kind & ACTION_INORDER:
+            banner = ('📈 Inorder Traversal', self.colors['active'])
+        if banner:
+            label, col = banner
+            self._tree_banner.set_text(label)
+            self._tree_banner.set_color(col)
+            self._tree_banner.get_bbox_patch().set_edgecolor(col)
+        self._tree_banner.set_visible(banner is not None)
         
         # Set appropriate limits
         x_coords = [p[0] for p in positions if p is not None]
@@ -500,551 +1421,292 @@ class AlgorithmVisualizer:
         if x_coords and y_coords:
             x_margin = (max(x_coords) - min(x_coords)) * 0.2 + 0.5
             y_margin = (max(y_coords) - min(y_coords)) * 0.2 + 0.5
-            self.ax_main.set_xlim(min(x_coords) - x_margin, max(x_coords) + x_margin)
-            self.ax_main.set_ylim(min(y_coords) - y_margin, max(y_coords) + y_margin)
+            self._set_main_limits(xlim=(min(x_coords) - x_margin, max(x_coords) + x_margin),
+                                  ylim=(min(y_coords) - y_margin, max(y_coords) + y_margin))
         
-        self.ax_main.set_xticks([])
-        self.ax_main.set_yticks([])
-        self.ax_main.set_title(step.get('description', ''), fontsize=14,
-                              color=self.colors['text'], pad=15, fontweight='bold')
+        self.ax_main.title.set_text(step.get('description', ''))
+    
+    def _add_node_count_text(self):
+        return self.ax_main.text(0.02, 0.95, '', transform=self.ax_main.transAxes,
+                                 ha='left', va='top', fontsize=12, fontweight='bold',
+                                 color=self.colors['text'], visible=False)
+    
+    def _update_node_count(self, n):
+        """Show 'n = X' instead of per-node labels on big structures; True = draw labels"""
+        labeled = n <= self.MAX_LABELED_NODES
+        if not labeled:
+            self._node_count_txt.set_text(f'n = {n}')
+        self._node_count_txt.set_visible(not labeled)
+        return labeled
+    
+    def _style_nodes(self, coll, styles, edge_rgba):
+        """Node circles: highlight fill, outline color/width gathered from the
+        (plain, highlighted) edge_rgba table"""
+        color_idx, outline_idx = styles
+        coll.set_facecolor(self._highlight_rgba[color_idx])
+        coll.set_edgecolor(edge_rgba[outline_idx])
+        coll.set_linewidth(self._node_edge_widths[outline_idx])
     
     def calculate_bst_positions(self, data):
         """Calculate ACTUAL BST positions based on tree structure derived from pre-order data"""
         if not data:
             return [], []
 
-        positions = [None] * len(data)
-        edges = []
-
-        # Rebuild BST from preorder traversal with value bounds
-        index = 0
-
-        class Node:
-            __slots__ = ("value", "idx", "left", "right")
-
-            def __init__(self, value, idx):
-                self.value = value
-                self.idx = idx
-                self.left = None
-                self.right = None
-
-        def build(lower, upper):
-            nonlocal index
-            if index >= len(data):
-                return None
+        values = np.asarray(data, dtype=np.float64)
+        parent, depth = _tree_positions(values)
+        placed = np.flatnonzero(parent != -2)
 
-            value = data[index]
-            if value <= lower or value >= upper:
-                return None
-
-            current_idx = index
-            index += 1
-
-            node = Node(value, current_idx)
-            node.left = build(lower, value)
-            node.right = build(value, upper)
-            return node
-
-        root = build(float("-inf"), float("inf"))
-
-        # Assign positions using in-order traversal to preserve BST ordering
+        # In-order position of a BST node is its rank among the placed values
         horizontal_spacing = 2.0
         vertical_spacing = 1.8
-        x_counter = 0
-
-        def assign_positions(node, depth):
-            nonlocal x_counter
-            if node is None:
-                return
-
-            assign_positions(node.left, depth + 1)
-
-            x = x_counter * horizontal_spacing
-            y = -depth * vertical_spacing
-            positions[node.idx] = (x, y)
-            x_counter += 1
-
-            assign_positions(node.right, depth + 1)
-
-        assign_positions(root, 0)
+        order = placed[np.argsort(values[placed], kind='stable')]
+        x = np.zeros(len(data))
+        x[order] = np.arange(len(order)) * horizontal_spacing
 
         # Center the tree horizontally
-        x_values = [pos[0] for pos in positions if pos is not None]
-        if x_values:
-            center_shift = (max(x_values) + min(x_values)) / 2.0
-            positions = [
-                (pos[0] - center_shift, pos[1]) if pos is not None else None
-                for pos in positions
-            ]
+        center_shift = (len(order) - 1) * horizontal_spacing / 2.0
 
-        # Collect edges based on reconstructed tree
-        def collect_edges(node):
-            if node is None:
-                return
-            if node.left:
-                edges.append((node.idx, node.left.idx))
-                collect_edges(node.left)
-            if node.right:
-                edges.append((node.idx, node.right.idx))
-                collect_edges(node.right)
+        coords = np.column_stack([x - center_shift, -depth * vertical_spacing]).tolist()
+        positions = [tuple(xy) if fits else None for xy, fits in zip(coords, parent != -2)]
 
-        collect_edges(root)
+        # Pre-order placement means edges come out parent-first, left before right
+        children = placed[parent[placed] >= 0]
+        edges = list(zip(parent[children].tolist(), children.tolist()))
 
         return positions, edges
     
     def update_info_panel(self, step):
-        self.ax_info.clear()
-        self.ax_info.set_facecolor(self.colors['panel_bg'])
-        
-        complexity = step.get('complexity', 'N/A')
+        complexity = step['complexity']
         progress = int((self.current_step + 1) / len(self.steps) * 100)
         
-        self.ax_info.text(0.5, 0.95, '📊 Algorithm Info', ha='center', va='top',
-                         fontsize=11, fontweight='bold', color=self.colors['text'],
-                         transform=self.ax_info.transAxes)
-        
-        self.ax_info.text(0.5, 0.70, f'Step {self.current_step + 1} / {len(self.steps)}',
-                         ha='center', va='center', fontsize=10, color='#4299E1',
-                         fontweight='bold', transform=self.ax_info.transAxes,
-                         bbox=dict(boxstyle='round,pad=0.5', facecolor='#2D3748', alpha=0.8))
-        
-        self.ax_info.text(0.5, 0.50, f'{progress}% Complete', ha='center', va='center',
-                         fontsize=9, color='#48BB78', transform=self.ax_info.transAxes)
-        
-        self.ax_info.text(0.5, 0.30, 'Time Complexity', ha='center', va='center',
-                         fontsize=9, color='#A0AEC0', transform=self.ax_info.transAxes)
-        
-        self.ax_info.text(0.5, 0.15, complexity, ha='center', va='center',
-                         fontsize=12, color='#48BB78', fontweight='bold',
-                         transform=self.ax_info.transAxes,
-                         bbox=dict(boxstyle='round,pad=0.4', facecolor='#2D3748', alpha=0.9))
-        
-        self.ax_info.set_xticks([])
-        self.ax_info.set_yticks([])
-        for spine in self.ax_info.spines.values():
-            spine.set_edgecolor('#4A5568')
-            spine.set_linewidth(1)
+        self._info_step_txt.set_text(f'Step {self.current_step + 1} / {len(self.steps)}')
+        self._info_progress_txt.set_text(f'{progress}% Complete')
+        self._info_complexity_txt.set_text(complexity)
+        self._dirty_axes.add(self.ax_info)
     
     def update_stats_panel(self):
-        self.ax_stats.clear()
-        self.ax_stats.set_facecolor(self.colors['panel_bg'])
-        
-        # Count operations based on C's action names
-        comparisons = sum(1 for i in range(self.current_step + 1) 
-                         if 'COMPARE' in self.steps[i].get('action', ''))
-        swaps = sum(1 for i in range(self.current_step + 1) 
-                   if 'SWAP' in self.steps[i].get('action', ''))
-        inserts = sum(1 for i in range(self.current_step + 1) 
-                     if 'INSERT' in self.steps[i].get('action', ''))
-        
-        self.ax_stats.text(0.5, 0.95, '📈 Live Statistics', ha='center', va='top',
-                          fontsize=11, fontweight='bold', color=self.colors['text'],
-                          transform=self.ax_stats.transAxes)
-        
-        stats = [('Comparisons', comparisons, '#4299E1'),
-                ('Swaps', swaps, '#48BB78'),
-                ('Inserts', inserts, '#ECC94B'),
-                ('Steps', self.current_step + 1, '#9F7AEA')]
-        
-        y_pos = 0.65
-        for label, value, color in stats:
-            self.ax_stats.text(0.15, y_pos, f'{label}:', ha='left', va='center',
-                              fontsize=9, color='#CBD5E0', transform=self.ax_stats.transAxes)
-            self.ax_stats.text(0.85, y_pos, str(value), ha='right', va='center',
-                              fontsize=11, fontweight='bold', color=color,
-                              transform=self.ax_stats.transAxes)
-            y_pos -= 0.25
+        # Count operations based on C's action names (prefix sums built at load)
+        comparisons, swaps, inserts = self._op_counts[self.current_step]
         
-        self.ax_stats.set_xticks([])
-        self.ax_stats.set_yticks([])
-        for spine in self.ax_stats.spines.values():
-            spine.set_edgecolor('#4A5568')
-            spine.set_linewidth(1)
+        values = (comparisons, swaps, inserts, self.current_step + 1)
+        for txt, value in zip(self._stat_value_txts, values):
+            txt.set_text(str(value))
+        self._dirty_axes.add(self.ax_stats)
     
     def update_progress_bar(self):
-        self.ax_progress.clear()
-        self.ax_progress.set_facecolor(self.colors['panel_bg'])
-        
         progress = (self.current_step + 1) / len(self.steps)
         
-        self.ax_progress.barh(0, 1, height=0.5, color='#2D3748', alpha=0.5,
-                             transform=self.ax_progress.transAxes)
-        self.ax_progress.barh(0, progress, height=0.5, color='#48BB78', alpha=0.9,
-                             transform=self.ax_progress.transAxes)
-        
-        self.ax_progress.text(0.5, 0, f'{int(progress*100)}%', ha='center', va='center',
-                             fontsize=10, color='#F7FAFC', fontweight='bold',
-                             transform=self.ax_progress.transAxes)
-        
-        self.ax_progress.set_xlim(0, 1)
-        self.ax_progress.set_ylim(-0.5, 0.5)
-        self.ax_progress.set_xticks([])
-        self.ax_progress.set_yticks([])
-        for spine in self.ax_progress.spines.values():
-            spine.set_edgecolor('#4A5568')
-            spine.set_linewidth(1)
+        self._progress_rect.set_width(progress)
+        self._progress_txt.set_text(f'{int(progress*100)}%')
+        self._dirty_axes.add(self.ax_progress)
     
     def update_learning_panel(self, step):
-        self.ax_learn.clear()
-        self.ax_learn.set_facecolor(self.colors['bg'])
-        
+        # The panel frame is only shown in learning mode
+        self.ax_learn.axis('on' if self.learning_mode else 'off')
+        self._learn_title_txt.set_visible(self.learning_mode)
+        self._learn_body_txt.set_visible(self.learning_mode)
+        self._dirty_axes.add(self.ax_learn)
         if not self.learning_mode:
-            self.ax_learn.axis('off')
             return
         
         action = step.get('action', '')
-        
-        self.ax_learn.text(0.02, 0.85, '💡 Learning Mode - What\'s Happening?',
-                          ha='left', va='top', fontsize=12, fontweight='bold',
-                          color='#ECC94B', transform=self.ax_learn.transAxes)
-        
-        explanation = self.get_explanation(action)
-        
-        self.ax_learn.text(0.05, 0.55, explanation, ha='left', va='top',
-                          fontsize=10, color='#E2E8F0', wrap=True,
-                          transform=self.ax_learn.transAxes,
-                          bbox=dict(boxstyle='round,pad=0.8', facecolor='#1A202C', alpha=0.9))
-        
-        self.ax_learn.set_xticks([])
-        self.ax_learn.set_yticks([])
-        for spine in self.ax_learn.spines.values():
-            spine.set_edgecolor('#4299E1')
-            spine.set_linewidth(2)
+        if action == self._last_learn_action:
+            return
+        self._last_learn_action = action
+        self._learn_body_txt.set_text(self.get_explanation(action))
     
     def update_code_panel(self, step):
-        self.ax_code.clear()
-        self.ax_code.set_facecolor(self.colors['dark_bg'])
-        
-        action = step.get('action', '')
-        code = self.get_pseudocode(action)
-        
-        self.ax_code.text(0.02, 0.92, '< Code />', ha='left', va='top',
-                         fontsize=11, fontweight='bold', color='#4299E1',
-                         transform=self.ax_code.transAxes)
-        
-        lines = code.split('\n')
-        y_pos = 0.75
-        for line in lines[:8]:
-            self.ax_code.text(0.05, y_pos, line, ha='left', va='top',
-                            fontsize=8, color='#48BB78', family='monospace',
-                            transform=self.ax_code.transAxes)
-            y_pos -= 0.12
+        # Whole algorithms share one snippet, e.g. every BUBBLE_* step
+        code = self.get_pseudocode(step.get('action', ''))
+        if code is self._last_code:
+            return
+        self._last_code = code
         
-        self.ax_code.set_xticks([])
-        self.ax_code.set_yticks([])
-        for spine in self.ax_code.spines.values():
-            spine.set_edgecolor('#2D3748')
-            spine.set_linewidth(1)
+        self._code_txt.set_text('\n'.join(code.split('\n')[:8]))
+        self._dirty_axes.add(self.ax_code)
     
     def get_explanation(self, action):
         """Explanations matching C's exact action names"""
-        explanations = {
-            'BUBBLE_COMPARE': 'Comparing adjacent elements in Bubble Sort.',
-            'BUBBLE_SWAP': 'Swapping adjacent elements because they are in wrong order.',
-            'BUBBLE_COMPLETE': 'Bubble Sort completed! Array is now sorted.',
-            
-            'SELECTION_START': 'Starting new pass of Selection Sort.',
-            'SELECTION_COMPARE': 'Comparing to find minimum element in unsorted portion.',
-            'SELECTION_SWAP': 'Swapping minimum element with current position.',
-            'SELECTION_COMPLETE': 'Selection Sort completed! Array is now sorted.',
-            
-            'INSERTION_START': 'Taking element to insert in correct position.',
-            'INSERTION_SHIFT': 'Shifting elements right to make space.',
-            'INSERTION_PLACE': 'Element placed in its correct sorted position.',
-            'INSERTION_COMPLETE': 'Insertion Sort completed! Array is now sorted.',
-            
-            'QUICK_START': 'Starting Quick Sort - divide and conquer algorithm.',
-            'QUICK_SUBARRAY': 'Processing a subarray - will partition around pivot.',
-            'QUICK_PIVOT_SELECT': 'Selected rightmost element as pivot.',
-            'QUICK_COMPARE': 'Comparing element with pivot for partitioning.',
-            'QUICK_SWAP': 'Swapping elements during partitioning.',
-            'QUICK_PIVOT_PLACE': 'Placing pivot in its final sorted position.',
-            'QUICK_PIVOT_FINAL': 'Pivot is now in correct position, dividing array.',
-            'QUICK_RECURSIVE': 'Recursively sorting left and right subarrays.',
-            'QUICK_COMPLETE': 'Quick Sort completed! Array is now sorted.',
-            
-            'MERGE_START': 'Starting Merge Sort - divide and conquer algorithm.',
-            'MERGE_DIVIDE': 'Dividing array into smaller subarrays.',
-            'MERGE_READY': 'Both halves sorted, ready to merge them.',
-            'MERGE_COMPARE': 'Comparing elements from both sorted subarrays.',
-            'MERGE_TAKE': 'Taking smaller element and placing in merged array.',
-            'MERGE_COPY': 'Copying remaining elements from subarray.',
-            'MERGE_COMPLETE_SUB': 'Subarray successfully merged and sorted.',
-            'MERGE_COMPLETE': 'Merge Sort completed! Array is now sorted.',
-            
-            'LINEAR_SEARCH': 'Checking each element sequentially from left to right.',
-            'LINEAR_SEARCH_FOUND': 'Target element found!',
-            'LINEAR_SEARCH_NOT_FOUND': 'Target not in array after checking all elements.',
-            
-            'BINARY_SEARCH': 'Checking middle element (array must be sorted).',
-            'BINARY_SEARCH_FOUND': 'Target found using binary search!',
-            'BINARY_SEARCH_NOT_FOUND': 'Target not found - search space exhausted.',
-            
-            'PUSH': 'Adding element to top of stack (LIFO).',
-            'POP_BEFORE': 'About to remove element from top of stack.',
-            'POP_AFTER': 'Element removed from stack top.',
-            
-            'ENQUEUE': 'Adding element to rear of queue (FIFO).',
-            'DEQUEUE_BEFORE': 'About to remove element from front of queue.',
-            'DEQUEUE_AFTER': 'Element removed from queue front.',
-            
-            'INSERT_BEGINNING': 'Inserted new node at the beginning of linked list.',
-            'INSERT_END': 'Inserted new node at the end of linked list.',
-            'INSERT_SEQUENTIAL': 'Adding element sequentially to linked list.',
-            'SEARCH_LIST': 'Traversing linked list to find target element.',
-            'SEARCH_LIST_FOUND': 'Target element found in linked list!',
-            'SEARCH_LIST_NOT_FOUND': 'Target not found after traversing entire list.',
-            
-            'INSERT_BST_ROOT': 'Creating root node for Binary Search Tree.',
-            'INSERT_BST_COMPARE_LEFT': 'Value is smaller - moving to left subtree.',
-            'INSERT_BST_COMPARE_RIGHT': 'Value is larger - moving to right subtree.',
-            'INSERT_BST_DUPLICATE': 'Duplicate value - BST does not allow duplicates.',
-            'INSERT_BST_COMPLETE': 'Node inserted while maintaining BST property.',
-            
-            'DELETE_BST_EMPTY': 'Cannot delete from empty BST.',
-            'DELETE_BST_SEARCH': 'Searching for node to delete in BST.',
-            'DELETE_BST_FOUND': 'Node found - proceeding with deletion.',
-            'DELETE_BST_COMPLETE': 'Node deleted and BST structure maintained.',
-            
-            'INORDER_TRAVERSAL': 'Visiting BST nodes in sorted order (left-root-right).'
-        }
-        
-        # Check for exact match first
-        if action in explanations:
-            return explanations[action]
-        
-        # Check for partial matches
-        for key, exp in explanations.items():
-            if key in action:
-                return exp
-        
-        return 'Processing data structure operation step by step.'
+        return _lookup_explanation(action)
     
     def get_pseudocode(self, action):
         """Pseudocode matching C implementations"""
-        codes = {
-            'BUBBLE': '''// Bubble Sort
-for (i = 0; i < n-1; i++)
-  for (j = 0; j < n-i-1; j++)
-    if (arr[j] > arr[j+1])
-      swap(&arr[j], &arr[j+1])''',
-      
-            'SELECTION': '''// Selection Sort
-for (i = 0; i < n-1; i++)
-  min_idx = i
-  for (j = i+1; j < n; j++)
-    if (arr[j] < arr[min_idx])
-      min_idx = j
-  swap(&arr[i], &arr[min_idx])''',
-  
-            'INSERTION': '''// Insertion Sort
-for (i = 1; i < n; i++)
-  key = arr[i]
-  j = i - 1
-  while (j >= 0 && arr[j] > key)
-    arr[j+1] = arr[j]
-    j--
-  arr[j+1] = key''',
-  
-            'QUICK': '''// Quick Sort
-quickSort(arr, low, high):
-  if (low < high)
-    pi = partition(arr, low, high)
-    quickSort(arr, low, pi-1)
-    quickSort(arr, pi+1, high)
-    
-partition: pivot = arr[high]
-  i = low - 1
-  for j = low to high-1
-    if arr[j] < pivot
-      swap(arr[++i], arr[j])
-  swap(arr[i+1], arr[high])''',
-  
-            'MERGE': '''// Merge Sort
-mergeSort(arr, left, right):
-  if (left < right)
-    mid = (left + right) / 2
-    mergeSort(arr, left, mid)
-    mergeSort(arr, mid+1, right)
-    merge(arr, left, mid, right)
-    
-merge: combines two sorted halves
-  into single sorted array''',
-  
-            'LINEAR': '''// Linear Search
-for (i = 0; i < n; i++)
-  if (arr[i] == target)
-    return i  // found
-return -1  // not found''',
-  
-            'BINARY': '''// Binary Search (sorted array)
-left = 0, right = n-1
-while (left <= right)
-  mid = left + (right-left)/2
-  if (arr[mid] == target)
-    return mid
-  else if (arr[mid] < target)
-    left = mid + 1
-  else
-    right = mid - 1''',
-  
-            'PUSH': '''// Stack Push
-push(stack, element):
-  if (!isFull())
-    stack.arr[++stack.top] = element''',
-  
-            'POP': '''// Stack Pop
-pop(stack):
-  if (!isEmpty())
-    return stack.arr[stack.top--]''',
-  
-            'ENQUEUE': '''// Queue Enqueue
-enqueue(queue, element):
-  if (!isFull())
-    if (front == -1) front = 0
-    queue.arr[++rear] = element''',
-  
-            'DEQUEUE': '''// Queue Dequeue
-dequeue(queue):
-  if (!isEmpty())
-    element = queue.arr[front++]
-    if (front > rear)
-      front = rear = -1
-    return element''',
-  
-            'INSERT': '''// Linked List Insert
-newNode = createNode(data)
-if (head == NULL)
-  head = newNode
-else
-  temp = head
-  while (temp->next != NULL)
-    temp = temp->next
-  temp->next = newNode''',
-  
-            'SEARCH': '''// Search in List/Tree
-current = head/root
-while (current != NULL)
-  if (current->data == target)
-    return current
-  current = current->next/left/right''',
-  
-            'BST': '''// Binary Search Tree
-insert(root, data):
-  if (root == NULL)
-    return createNode(data)
-  if (data < root->data)
-    root->left = insert(root->left, data)
-  else if (data > root->data)
-    root->right = insert(root->right, data)
-  return root  // no duplicates
-
-delete(root, data):
-  if (root == NULL) return root
-  if (data < root->data)
-    root->left = delete(root->left, data)
-  else if (data > root->data)
-    root->right = delete(root->right, data)
-  else
-    // Node with one or no child
-    if (root->left == NULL)
-      return root->right
-    else if (root->right == NULL)
-      return root->left
-    // Node with two children
-    temp = findMin(root->right)
-    root->data = temp->data
-    root->right = delete(root->right, temp->data)
-  return root'''
-        }
-        
-        # Check for matches
-        for key, code in codes.items():
-            if key in action:
-                return code
-        
-        return '// Processing data structure\nprocess(structure);'
+        return _lookup_pseudocode(action)
     
-    def update_visualization(self):
+    def update_visualization(self, full=True):
         if not self.steps:
             return
         
         step = self.steps[self.current_step]
         
-        # Choose visualization based on structure type
-        structure = self.config.get('structure_type', 'array')
-        
-        if self.is_sorting_algorithm() or 'SEARCH' in step.get('action', ''):
+        # Search steps are always shown as bars, whatever the structure
+        if self._action_kind[self.current_step] & ACTION_SEARCH:
             self.visualize_sorting_bars(step)
-        elif structure == 'stack' or self.config.get('is_stack', False):
-            self.visualize_stack_vertical(step)
-        elif structure == 'queue' or self.config.get('is_queue', False):
-            self.visualize_queue_horizontal(step)
-        elif structure == 'linked_list' or self.config.get('is_linked_list', False):
-            self.visualize_linked_list_proper(step)
-        elif structure == 'binary_search_tree' or self.config.get('is_binary_search_tree', False):
-            self.visualize_binary_search_tree(step)
         else:
-            self.visualize_sorting_bars(step)
+            self._active_vis(step)
+        self._dirty_axes.add(self.ax_main)
         
         # Update all panels
         self.update_info_panel(step)
-        self.update_stats_panel()
         self.update_progress_bar()
+        behind = self.current_step - self._slow_panels_step
+        if full or not 0 <= behind < self.disp_skip or self._action_changed():
+            self.update_slow_panels(step)
+        
+        self._blit()
+    
+    def update_slow_panels(self, step):
+        self._slow_panels_step = self.current_step
+        self.update_stats_panel()
         self.update_learning_panel(step)
         self.update_code_panel(step)
-        
-        plt.draw()
     
-    def animate(self, frame):
-        if self.is_playing and self.current_step < len(self.steps) - 1:
-            self.current_step += 1
-            self.update_visualization()
-        elif self.current_step >= len(self.steps) - 1:
-            self.is_playing = False
-            self.btn_play.label.set_text('↻ Restart')
-        return []
+    def _action_changed(self):
+        i = self.current_step
+        return i == 0 or self.steps[i].get('action') != self.steps[i - 1].get('action')
+    
+    def animate(self):
+        # A tick already queued when playback paused has nothing to do;
+        # if rendering can't keep up with the interval, skip ticks instead of queueing them
+        if not self.is_playing or self._rendering:
+            return
+        self._rendering = True
+        try:
+            if self.is_playing and self.current_step < len(self.steps) - 1:
+                # Normally one stride per tick. Only when rendering fell more than a
+                # stride behind the clock does playback jump to the step that is due;
+                # the clock is re-anchored every tick, so timers that re-arm after each
+                # callback (drifting by the render time) never skip steps.
+                # Skipped steps still count: the stats panel reads cumulative totals
+                t0, s0 = self._clock
+                now = time.perf_counter()
+                due = s0 + int((now - t0) * self.speed) * self._stride
+                next_step = self.current_step + self._stride
+                if due > next_step + self._stride:
+                    next_step = due
+                self.current_step = min(next_step, len(self.steps) - 1)
+                self._clock = (now, self.current_step)
+                last = self.current_step == len(self.steps) - 1
+                if last:
+                    # Stop ticking as soon as the final step is up
+                    self.stop_playback()
+                # Throttle the slow panels, but always finish on a fully updated frame
+                self.update_visualization(full=last)
+            else:
+                self.stop_playback()
+                self._blit()
+        finally:
+            self._rendering = False
+    
+    def export_animation(self, path):
+        """Render every step to a video (GIF via Pillow, anything else via ffmpeg)"""
+        writer_cls = PillowWriter if path.lower().endswith('.gif') else FFMpegWriter
+        if not writer_cls.isAvailable():
+            raise RuntimeError(f"{writer_cls.__name__} is not available (is ffmpeg installed?)")
+        
+        # The controls do nothing in a video
+        for widget in (self.btn_play, self.btn_reset, self.btn_back, self.btn_forward,
+                       self.btn_learn, self.slider_speed):
+            widget.ax.set_visible(False)
+        
+        writer = writer_cls(fps=self.speed)
+        with writer.saving(self.fig, path, dpi=self.fig.dpi):
+            for i in range(len(self.steps)):
+                self.current_step = i
+                self.update_visualization()
+                writer.grab_frame()
+        print(f"🎬 Exported {len(self.steps)} frames to {path}")
+    
+    def stop_playback(self):
+        """Stop the frame timer; the button offers Restart on the last step"""
+        self.is_playing = False
+        self.timer.stop()
+        at_end = self.current_step >= len(self.steps) - 1
+        self.btn_play.label.set_text('↻ Restart' if at_end else '▶ Play')
+        self._dirty_axes.add(self.btn_play.ax)
     
     def toggle_play(self, event):
-        if self.current_step >= len(self.steps) - 1:
-            self.current_step = 0
+        if self.is_playing:
+            self.stop_playback()
+            if self.steps:
+                # Playback may have skipped panel refreshes - settle them on the paused step
+                self.update_slow_panels(self.steps[self.current_step])
+        else:
+            if self.current_step >= len(self.steps) - 1:
+                self.current_step = 0
             self.is_playing = True
+            self._start_clock()
             self.btn_play.label.set_text('⏸ Pause')
-        else:
-            self.is_playing = not self.is_playing
-            self.btn_play.label.set_text('⏸ Pause' if self.is_playing else '▶ Play')
+            self._dirty_axes.add(self.btn_play.ax)
+            self.timer.start()
+        self._blit()
     
     def reset_animation(self, event):
         self.current_step = 0
-        self.is_playing = False
-        self.btn_play.label.set_text('▶ Play')
+        self.stop_playback()
         self.update_visualization()
     
     def step_back(self, event):
         if self.current_step > 0:
             self.current_step -= 1
-            self.is_playing = False
-            self.btn_play.label.set_text('▶ Play')
+            self.stop_playback()
             self.update_visualization()
     
     def step_forward(self, event):
         if self.current_step < len(self.steps) - 1:
             self.current_step += 1
-            self.is_playing = False
-            self.btn_play.label.set_text('▶ Play')
+            self.stop_playback()
             self.update_visualization()
     
     def toggle_learning_mode(self, event):
         self.learning_mode = not self.learning_mode
         print(f"💡 Learning Mode: {'ON' if self.learning_mode else 'OFF'}")
+        # The learning panel frame is part of the background - force a full draw
+        self._bg = None
         self.update_visualization()
     
+    def on_key(self, event):
+        if event.key in self.KEYS:
+            getattr(self, self.KEYS[event.key])(event)
+        elif event.key in ('+', '=', '-'):
+            step = -0.5 if event.key == '-' else 0.5
+            slider = self.slider_speed
+            # Goes through update_speed like a drag would
+            slider.set_val(min(max(self.speed + step, slider.valmin), slider.valmax))
+        elif self._pass_keys:
+            key_press_handler(event, self.fig.canvas)
+    
+    def _start_playback(self, event):
+        """First draw of the window: start the clock and the frame timer"""
+        self.fig.canvas.mpl_disconnect(self._first_draw_cid)
+        if self.is_playing:
+            self._start_clock()
+            self.timer.start()
+    
+    def _start_clock(self):
+        """Anchor playback time to the current step"""
+        self._clock = (time.perf_counter(), self.current_step)
+    
     def update_speed(self, val):
         self.speed = val
-        if hasattr(self, 'ani'):
-            self.ani.event_source.interval = int(1000 / self.speed)
+        # The new rate counts from here, not from when playback started
+        self._start_clock()
+        # Debounce: every slider event restarts the countdown
+        if hasattr(self, '_speed_timer'):
+            self._speed_timer.stop()
+            self._speed_timer.start()
+    
+    def apply_speed(self):
+        self.timer.interval = int(1000 / self.speed)
 
 def main():
+    # --export [FILE] renders the steps to a video on the Agg backend instead of opening a window
+    parser = argparse.ArgumentParser(description='Visualize the steps written by the C program')
+    parser.add_argument('--export', nargs='?', const='algorithm.mp4', metavar='FILE',
+                        help='render every step to FILE (.gif via Pillow, anything else via '
+                             'ffmpeg; default algorithm.mp4)')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("🎨 ALGORITHM VISUALIZER v10.0 - ENHANCED BST")
     print("=" * 70)
@@ -1075,14 +1737,21 @@ def main():
         input("Press Enter to exit...")
         return
     
+    export_path = args.export
+    if export_path:
+        plt.switch_backend('Agg')
+    
     try:
-        visualizer = AlgorithmVisualizer()
+        visualizer = AlgorithmVisualizer(export_path)
     except KeyboardInterrupt:
         print("\n⏹ Visualization stopped by user")
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        if export_path:
+            # Exports run from scripts: fail with a status instead of waiting for Enter
+            sys.exit(1)
         input("Press Enter to exit...")
 
 if __name__ == "__main__":